@@ -0,0 +1,115 @@
+""" Micro-benchmark of `parse_entered_duration` against the implementation it replaced.
+
+Run from the repository root:
+    python -m benchmarks.parse_duration
+"""
+
+import re
+import timeit
+
+from dateutil.relativedelta import relativedelta
+
+from cogs.utils.common import parse_entered_duration
+
+
+INPUTS = [
+    "10m",
+    "7d,5h",
+    "2h, 30 min, 5 days, 1 seco",
+    "1 year and 6 months",
+    "3 weeks + 2 days & 12 hours",
+    "5 potatoes, 2h",
+    "49 months",
+]
+
+
+def legacy_parse_entered_duration(when: str) -> tuple[relativedelta, list[str], list[str]]:
+    """ The per-segment regex and `elif` chain used before the table-driven parser. """
+
+    duration = relativedelta()
+
+    invalid_formats = []
+    too_long = []
+
+    when: list[str] = when.replace('and', ',').replace('&', ',').replace('+', ',').split(',')
+    for d in when:
+        d = d.strip()
+        if not d:
+            continue
+
+        # The whole part must be a number followed by a unit, e.g. '10 min'
+        match = re.fullmatch(r"(\d+)\s*([A-Za-z]+)", d)
+
+        if match:
+            value = int(match.group(1))  # The number (value)
+            unit = match.group(2).lower()  # The unit (characters)
+
+            if "seconds".startswith(unit) or unit == "secs":
+                if value > 4 * 12 * 30 * 24 * 60 * 60:
+                    too_long.append(d)
+                    continue
+                duration += relativedelta(seconds=value)
+
+            elif "minutes".startswith(unit) or unit == "mins":
+                if value > 4 * 12 * 30 * 24 * 60:
+                    too_long.append(d)
+                    continue
+                duration += relativedelta(minutes=value)
+
+            elif "hours".startswith(unit) or unit == "hrs" or unit == "hr":
+                if value > 4 * 12 * 30 * 24:
+                    too_long.append(d)
+                    continue
+                duration += relativedelta(hours=value)
+
+            elif "days".startswith(unit):
+                if value > 4 * 12 * 30:
+                    too_long.append(d)
+                    continue
+                duration += relativedelta(days=value)
+
+            elif "weeks".startswith(unit):
+                if value > 4 * 12 * 4:
+                    too_long.append(d)
+                    continue
+                duration += relativedelta(weeks=value)
+
+            elif "months".startswith(unit):
+                if value > 4 * 12:
+                    too_long.append(d)
+                    continue
+                duration += relativedelta(months=value)
+
+            elif "years".startswith(unit) or unit == "yrs" or unit == "yr":
+                if value > 4:
+                    too_long.append(d)
+                    continue
+                duration += relativedelta(years=value)
+
+            else:
+                invalid_formats.append(d)
+
+        else:
+            invalid_formats.append(d)
+
+    return duration, invalid_formats, too_long
+
+
+def main(number: int = 20_000) -> None:
+    for when in INPUTS:
+        assert legacy_parse_entered_duration(when) == parse_entered_duration(when), when
+
+    print(f"{'input':<32} {'legacy':>10} {'current':>10} {'speedup':>8}")
+    total_legacy = total_current = 0.0
+    for when in INPUTS:
+        legacy = min(timeit.repeat(lambda: legacy_parse_entered_duration(when), number=number, repeat=5)) / number
+        current = min(timeit.repeat(lambda: parse_entered_duration(when), number=number, repeat=5)) / number
+        total_legacy += legacy
+        total_current += current
+        print(f"{when!r:<32} {legacy * 1e6:>8.2f}us {current * 1e6:>8.2f}us {legacy / current:>7.2f}x")
+
+    print(f"{'total':<32} {total_legacy * 1e6:>8.2f}us {total_current * 1e6:>8.2f}us {total_legacy / total_current:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
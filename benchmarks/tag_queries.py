@@ -0,0 +1,144 @@
+""" EXPLAIN and timings of tag lookups, before and after the `name_lower` column.
+
+Builds two temporary tables in the configured MariaDB database (from `.env`, like the bot), one with
+the old schema and one with the new, fills both with the same tags, then prints the query plan and
+average time of each lookup. Temporary tables are dropped when the connection closes, so the bot's
+data is never touched.
+
+No plans or timings are recorded in the repository; run this against your own server to check that
+the new lookups use the `(guild_id, name_lower)` index.
+
+Run from the repository root:
+    python -m benchmarks.tag_queries
+"""
+
+import asyncio
+import os
+import random
+import string
+import time
+
+import asyncmy
+from dotenv import load_dotenv
+
+
+GUILDS = 50
+TAGS_PER_GUILD = 2000
+RUNS = 200
+
+SCHEMA_BEFORE = '''
+    CREATE TEMPORARY TABLE `bench_tags_before` (
+      `id` int(11) NOT NULL AUTO_INCREMENT,
+      `user_id` bigint(20) UNSIGNED NOT NULL,
+      `guild_id` bigint(20) UNSIGNED NOT NULL,
+      `created` datetime NOT NULL,
+      `name` varchar(32) NOT NULL,
+      `content` varchar(2000) NOT NULL,
+      PRIMARY KEY (`id`),
+      UNIQUE KEY `unique_guild_name` (`guild_id`,`name`),
+      KEY `idx_user_guild` (`user_id`,`guild_id`)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci
+'''
+
+SCHEMA_AFTER = '''
+    CREATE TEMPORARY TABLE `bench_tags_after` (
+      `id` int(11) NOT NULL AUTO_INCREMENT,
+      `user_id` bigint(20) UNSIGNED NOT NULL,
+      `guild_id` bigint(20) UNSIGNED NOT NULL,
+      `created` datetime NOT NULL,
+      `name` varchar(32) NOT NULL,
+      `name_lower` varchar(32) NOT NULL,
+      `content` varchar(2000) NOT NULL,
+      PRIMARY KEY (`id`),
+      UNIQUE KEY `unique_guild_name_lower` (`guild_id`,`name_lower`),
+      KEY `idx_user_guild` (`user_id`,`guild_id`)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci
+'''
+
+# (label, query before, query after); every query takes (guild_id, name)
+QUERIES = [
+    (
+        "get_tag",
+        "SELECT * FROM bench_tags_before WHERE LOWER(name) = LOWER(%s) AND guild_id = %s",
+        "SELECT * FROM bench_tags_after WHERE guild_id = %s AND name_lower = %s",
+    ),
+    (
+        "autocomplete (prefix)",
+        "SELECT * FROM bench_tags_before WHERE LOWER(name) LIKE %s AND guild_id = %s LIMIT 15",
+        "SELECT name FROM bench_tags_after WHERE guild_id = %s AND name_lower LIKE %s LIMIT 15",
+    ),
+]
+
+
+def random_name() -> str:
+    return ''.join(random.choices(string.ascii_letters, k=random.randint(4, 16)))
+
+
+async def explain(cursor, query: str, params: tuple) -> None:
+    await cursor.execute(f"EXPLAIN {query}", params)
+    columns = [column[0] for column in cursor.description]
+    for row in await cursor.fetchall():
+        print("    " + ', '.join(f"{column}={value}" for column, value in zip(columns, row)))
+
+
+async def timed(cursor, query: str, params: tuple) -> float:
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        await cursor.execute(query, params)
+        await cursor.fetchall()
+    return (time.perf_counter() - start) / RUNS
+
+
+async def main() -> None:
+    load_dotenv()
+    conn = await asyncmy.connect(
+        user=os.getenv('MARIADB_USERNAME'),
+        password=os.getenv('MARIADB_PASSWORD'),
+        host=os.getenv('MARIADB_HOST'),
+        db='Woolinator',
+        autocommit=True,
+    )
+
+    try:
+        async with conn.cursor() as cursor:
+            await cursor.execute(SCHEMA_BEFORE)
+            await cursor.execute(SCHEMA_AFTER)
+
+            rows = []
+            for guild_id in range(1, GUILDS + 1):
+                names = {random_name().lower(): None for _ in range(TAGS_PER_GUILD)}
+                for name in names:
+                    name = name.capitalize()
+                    rows.append((random.randint(1, 500), guild_id, name, name.lower(), 'x' * 1500))
+
+            await cursor.executemany(
+                "INSERT INTO bench_tags_before (user_id, guild_id, created, name, content) VALUES (%s, %s, NOW(), %s, %s)",
+                [(user_id, guild_id, name, content) for user_id, guild_id, name, _, content in rows])
+            await cursor.executemany(
+                "INSERT INTO bench_tags_after (user_id, guild_id, created, name, name_lower, content) VALUES (%s, %s, NOW(), %s, %s, %s)",
+                rows)
+            await cursor.execute("ANALYZE TABLE bench_tags_before, bench_tags_after")
+            await cursor.fetchall()
+
+            _, guild_id, name, name_lower, _ = random.choice(rows)
+            print(f"{len(rows)} tags across {GUILDS} guilds, looking up '{name}' in guild {guild_id}\n")
+
+            for label, before, after in QUERIES:
+                value = name if label == "get_tag" else name_lower[:3] + '%'
+                before_params = (value, guild_id)
+                after_params = (guild_id, value.lower())
+
+                print(f"{label}, before:")
+                await explain(cursor, before, before_params)
+                print(f"{label}, after:")
+                await explain(cursor, after, after_params)
+
+                before_time = await timed(cursor, before, before_params)
+                after_time = await timed(cursor, after, after_params)
+                print(f"  {before_time * 1e3:.3f}ms -> {after_time * 1e3:.3f}ms ({before_time / after_time:.1f}x)\n")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -9,6 +9,7 @@ from discord.ext import commands
 import aiohttp
 
 from cogs.utils.context import Context
+from cogs.utils.message_cache import MessageCache
 
 log = logging.getLogger(__name__)
 
@@ -41,6 +42,7 @@ class Woolinator(commands.Bot):
             tree_cls=AppCommandsTree,
             activity=discord.Activity(type=discord.ActivityType.watching, name='meow meow meow meow meoowww'),
             allowed_mentions=discord.AllowedMentions(roles=False, everyone=False, users=True, replied_user=False),
+            max_messages=None,  # message logs and snipes use `self.message_cache` instead of full `discord.Message`s
         )
 
         self.default_prefix = '?'
@@ -49,6 +51,10 @@ class Woolinator(commands.Bot):
 
         self.spam_control = commands.CooldownMapping.from_cooldown(4, 8, commands.BucketType.user)
 
+        # Compact copy of recent guild messages for edit/delete logs & snipes. Feeds the custom
+        # `cached_message_delete`, `cached_bulk_message_delete` and `cached_message_edit` events.
+        self.message_cache = MessageCache()
+
     async def setup_hook(self) -> None:
         self.uptime = discord.utils.utcnow()
         self.session = aiohttp.ClientSession()
@@ -103,10 +109,11 @@ class Woolinator(commands.Bot):
                 log.exception('Failed to load extension %s.', extension)
 
     @asynccontextmanager
-    async def get_cursor(self):
+    async def get_cursor(self, cursor_type: type[asyncmy.cursors.Cursor] | None = None):
+        """ A cursor on a pooled connection; pass `asyncmy.cursors.SSCursor` to stream large results. """
         conn = await self.pool.acquire()
         try:
-            async with conn.cursor() as cursor:
+            async with conn.cursor(cursor_type) as cursor:
                 yield cursor
         finally:
             await self.pool.release(conn)
@@ -124,6 +131,10 @@ class Woolinator(commands.Bot):
         await super().start(os.getenv('BOT_TOKEN'))
 
     async def close(self) -> None:
+        logging_cog = self.get_cog("Logging")
+        if logging_cog is not None:
+            log.info(' - Flushing queued log messages')
+            await logging_cog.flush_logs()
         log.info(' - Closing the connection to Discord')
         await super().close()
         log.info(' - Closing the SQL connection pool')
@@ -134,10 +145,28 @@ class Woolinator(commands.Bot):
         log.info('Done. Bye!')
 
     async def on_message(self, message: discord.Message) -> None:
+        if message.guild is not None:
+            self.message_cache.add(message)
         if message.author.bot:
             return
         await self.process_commands(message)
 
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent) -> None:
+        cached = self.message_cache.pop(payload.message_id)
+        if cached is not None:
+            self.dispatch('cached_message_delete', cached)
+
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent) -> None:
+        cached = [m for m in map(self.message_cache.pop, payload.message_ids) if m is not None]
+        self.dispatch('cached_bulk_message_delete', payload, cached)
+
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent) -> None:
+        if payload.guild_id is None:
+            return
+        before = self.message_cache.update(payload.message)
+        if before is not None and before.content != payload.message.content:
+            self.dispatch('cached_message_edit', before, payload.message)
+
     async def get_context(self, message: discord.Interaction|discord.Message, *, cls=Context):
         return await super().get_context(message, cls=cls)
 
@@ -1,4 +1,8 @@
+import asyncio
+import io
+import json
 import logging
+from datetime import datetime, timedelta, timezone
 
 import discord
 from discord import ui
@@ -6,9 +10,10 @@ from discord.ext import commands
 from discord.utils import escape_markdown as rmd
 
 from .utils import checks
-from .utils.common import trim_str
+from .utils.common import trim_str, role_diff
 from .utils.context import Context
 from .utils.emojis import Emojis
+from .utils.message_cache import CachedMessage
 from .utils.views import handle_view_edit
 
 from bot import Woolinator
@@ -53,6 +58,12 @@ LOG_FEATURES: dict[str, dict[str, str]] = {
 
 ACCENT = 0xFFF9E0
 
+# Seconds of quiet after a voice join/move/leave before it's logged, and the longest a trail is held
+VOICE_WINDOW_DEFAULT = 10
+VOICE_MAX_HOLD_DEFAULT = 60
+VOICE_WINDOW_CHOICES = {0: "Off (log every change)", 5: "5 seconds", 10: "10 seconds", 15: "15 seconds", 30: "30 seconds", 60: "1 minute"}
+VOICE_MAX_HOLD_CHOICES = {30: "30 seconds", 60: "1 minute", 120: "2 minutes", 300: "5 minutes", 600: "10 minutes"}
+
 # Channel types offered when picking channels/categories to exclude from message logs
 IGNORE_CHANNEL_TYPES = [
     discord.ChannelType.text,
@@ -131,6 +142,40 @@ class MessageIgnoreSelect(ui.ChannelSelect):
         await interaction.response.edit_message(embed=self.lview.feature_embed("log-messages"), view=self.lview)
 
 
+class VoiceWindowSelect(ui.Select):
+    """ Dropdown: how long to wait for further voice changes before logging them as one entry. """
+
+    def __init__(self, parent: "LoggingView"):
+        self.lview = parent
+        window, _ = parent.cog.get_voice_debounce(parent.guild_id)
+        options = [discord.SelectOption(label=f"Group changes: {label}", value=str(secs), default=secs == window)
+                   for secs, label in VOICE_WINDOW_CHOICES.items()]
+        super().__init__(placeholder="Group rapid voice changes…", min_values=1, max_values=1, options=options)
+
+    async def callback(self, interaction: discord.Interaction):
+        _, max_hold = self.lview.cog.get_voice_debounce(self.lview.guild_id)
+        await self.lview.cog.set_voice_debounce(self.lview.guild_id, int(self.values[0]), max_hold)
+        self.lview.show_feature("log-voice")
+        await interaction.response.edit_message(embed=self.lview.feature_embed("log-voice"), view=self.lview)
+
+
+class VoiceMaxHoldSelect(ui.Select):
+    """ Dropdown: the longest a grouped voice entry is held back before it's logged anyway. """
+
+    def __init__(self, parent: "LoggingView"):
+        self.lview = parent
+        _, max_hold = parent.cog.get_voice_debounce(parent.guild_id)
+        options = [discord.SelectOption(label=f"Log at most every {label}", value=str(secs), default=secs == max_hold)
+                   for secs, label in VOICE_MAX_HOLD_CHOICES.items()]
+        super().__init__(placeholder="Maximum hold time…", min_values=1, max_values=1, options=options)
+
+    async def callback(self, interaction: discord.Interaction):
+        window, _ = self.lview.cog.get_voice_debounce(self.lview.guild_id)
+        await self.lview.cog.set_voice_debounce(self.lview.guild_id, window, int(self.values[0]))
+        self.lview.show_feature("log-voice")
+        await interaction.response.edit_message(embed=self.lview.feature_embed("log-voice"), view=self.lview)
+
+
 class DisableButton(ui.Button):
     def __init__(self, parent: "LoggingView"):
         self.lview = parent
@@ -206,6 +251,13 @@ class LoggingView(ui.View):
             else:
                 ignored_str = "*None*"
             desc += f"\n\n**Ignored:**\n> -# Edits & deletions in these channels (or categories) won't be logged.\n{ignored_str}"
+        elif code == "log-voice":
+            window, max_hold = self.cog.get_voice_debounce(self.guild_id)
+            if window:
+                grouping = f"A change is logged straight away; more changes less than {window}s after it are combined into one entry (held for at most {max_hold}s)."
+            else:
+                grouping = "*Off* - every join, move & leave is logged separately."
+            desc += f"\n\n**Grouping:**\n> -# Stops members hopping between channels from flooding the log.\n{grouping}"
         embed = discord.Embed(
             title=f"{meta['emoji']} {meta['label']}",
             description=desc,
@@ -224,6 +276,9 @@ class LoggingView(ui.View):
         self.add_item(FeatureChannelSelect(self, code))
         if code == "log-messages":
             self.add_item(MessageIgnoreSelect(self))
+        elif code == "log-voice":
+            self.add_item(VoiceWindowSelect(self))
+            self.add_item(VoiceMaxHoldSelect(self))
         if self.config.get(code):
             self.add_item(DisableButton(self))
         self.add_item(BackButton(self))
@@ -240,60 +295,345 @@ class LoggingView(ui.View):
         await handle_view_edit(self.message, view=self)
 
 
+class LogOutbox:
+    """ Durable delivery for log embeds.
+
+    Entries are written to the `log_outbox` table before `put` returns (entries arriving together share
+    one INSERT), then sent from there in batches, up to 10 embeds per webhook message. Failed sends stay
+    in the table and are retried with exponential backoff, so logs survive Discord outages and restarts.
+    """
+
+    def __init__(self, cog: "Logging"):
+        self.cog = cog
+        self.bot = cog.bot
+        # (guild_id, channel_id, JSON payload, future resolved once stored) waiting for the next INSERT
+        self.buffer: list[tuple[int, int, str, asyncio.Future]] = []
+        self._writer: asyncio.Task | None = None
+        self._unsent = 0  # entries stored since the last drain
+        self._wake = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+        self._backlog = True  # rows may be due right now (e.g. left over from the last run)
+        self._retry_at: datetime | None = None  # earliest retry of a row that failed before
+
+    def start(self) -> None:
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="log-outbox")
+
+    async def stop(self) -> None:
+        """ Stop the drainer once its current batch is sent, and make one last attempt at everything pending. """
+        if self._task is not None:
+            self._stopping = True
+            self._wake.set()
+            if not self.bot.is_ready():
+                self._task.cancel()  # still waiting for the bot, so nothing is in flight
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._writer is not None:
+            await asyncio.gather(self._writer, return_exceptions=True)
+        await self.drain()
+
+    async def put(self, guild_id: int, channel_id: int, payload: dict) -> None:
+        """ Store an entry for delivery, returning once it's in the database. """
+        future = asyncio.get_running_loop().create_future()
+        self.buffer.append((guild_id, channel_id, json.dumps(payload), future))
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._persist())
+        await future
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.cog.batch_delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            if self._stopping:
+                break
+            try:
+                await self.drain()
+            except Exception:
+                log.exception("Failed to drain the log outbox")
+
+    async def _persist(self) -> None:
+        # Entries added while an INSERT is running go in the next one
+        while self.buffer:
+            rows, self.buffer = self.buffer, []
+            now = discord.utils.utcnow()
+            try:
+                async with self.bot.get_cursor() as cursor:
+                    await cursor.executemany('''
+                            INSERT INTO log_outbox (guild_id, channel_id, payload, next_attempt)
+                            VALUES (%s, %s, %s, %s)
+                        ''', [(guild_id, channel_id, payload, now) for guild_id, channel_id, payload, _ in rows])
+            except Exception as e:
+                for *_, future in rows:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for *_, future in rows:
+                if not future.done():
+                    future.set_result(None)
+            self._backlog = True
+            self._unsent += len(rows)
+            if self._unsent >= self.cog.batch_size:
+                self._wake.set()
+
+    async def drain(self) -> None:
+        async with self._lock:
+            self._unsent = 0
+            now = discord.utils.utcnow()
+            if not self._backlog and (self._retry_at is None or self._retry_at > now):
+                return
+
+            limit = self.cog.batch_size * 10
+            async with self.bot.get_cursor() as cursor:
+                await cursor.execute('''
+                        SELECT id, channel_id, payload, attempts
+                        FROM log_outbox
+                        WHERE next_attempt <= %s
+                        ORDER BY id
+                        LIMIT %s
+                    ''', (now, limit))
+                rows = await cursor.fetchall()
+            self._backlog = len(rows) == limit
+
+            # Keep each channel's entries in order; channels are delivered concurrently
+            by_channel: dict[int, list[tuple[int, dict, int]]] = {}
+            for row_id, channel_id, payload, attempts in rows:
+                by_channel.setdefault(channel_id, []).append((row_id, json.loads(payload), attempts))
+
+            results = await asyncio.gather(*(self._deliver(cid, entries) for cid, entries in by_channel.items()))
+            done = [row_id for sent, _ in results for row_id in sent]
+            failed = [entry for _, retry in results for entry in retry]
+
+            async with self.bot.get_cursor() as cursor:
+                if done:
+                    await cursor.execute(f"DELETE FROM log_outbox WHERE id IN ({', '.join(['%s'] * len(done))})", done)
+                if failed:
+                    await cursor.executemany(
+                        "UPDATE log_outbox SET attempts = attempts + 1, next_attempt = %s WHERE id = %s",
+                        [(now + timedelta(seconds=self.cog.retry_base * 2 ** attempts), row_id) for row_id, attempts in failed],
+                    )
+                await cursor.execute("SELECT MIN(next_attempt) FROM log_outbox")
+                res = await cursor.fetchone()
+            self._retry_at = res[0].replace(tzinfo=timezone.utc) if res and res[0] else None
+
+    async def _deliver(self, channel_id: int, entries: list[tuple[int, dict, int]]) -> tuple[list[int], list[tuple[int, int]]]:
+        """ Send one channel's entries, returning the row IDs that are finished and the (id, attempts) to retry. """
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            # Not in the cache, which also happens while a guild is unavailable; only drop the entries
+            # once Discord says the channel is really gone (or out of reach)
+            try:
+                channel = await self.bot.fetch_channel(channel_id)
+            except (discord.NotFound, discord.Forbidden):
+                return [row_id for row_id, _, _ in entries], []
+            except discord.HTTPException:
+                return [], [(row_id, attempts) for row_id, _, attempts in entries]
+
+        done, retry = [], []
+        i = 0
+        while i < len(entries):
+            count = 1
+            if self._batchable(entries[i][1]):
+                while count < self.cog.batch_size and i + count < len(entries) and self._batchable(entries[i + count][1]):
+                    count += 1
+            batch = entries[i:i + count]
+            i += count
+
+            payload = batch[0][1]
+            view = file = None
+            if payload.get("jump_url"):
+                view = ui.View()
+                view.add_item(ui.Button(style=discord.ButtonStyle.link, label="Jump to Message", url=payload["jump_url"]))
+            if payload.get("file"):
+                file = discord.File(io.BytesIO(payload["file"]["content"].encode("utf-8")), filename=payload["file"]["filename"])
+
+            embeds = [discord.Embed.from_dict(p["embed"]) for _, p, _ in batch]
+            if await self.cog._send_via_webhook(channel, embeds, view, file):
+                done.extend(row_id for row_id, _, _ in batch)
+                continue
+
+            for row_id, _, attempts in batch:
+                if attempts + 1 >= self.cog.max_attempts:
+                    log.warning("Dropping log entry %s for channel %s after %s failed attempts", row_id, channel_id, attempts + 1)
+                    done.append(row_id)
+                else:
+                    retry.append((row_id, attempts))
+        return done, retry
+
+    @staticmethod
+    def _batchable(payload: dict) -> bool:
+        return not payload.get("jump_url") and not payload.get("file")
+
+
+class VoiceTrail:
+    """ A member's recent voice channel changes; any that haven't been logged yet are held back to be logged as one entry. """
+
+    __slots__ = ('channels', 'member', 'started', 'first_seen', 'timer')
+
+    def __init__(self, start: int | None, member: discord.Member):
+        self.channels: list[int | None] = [start]  # channel IDs visited since the last log, `None` = not in voice
+        self.member = member  # kept for logging the trail if they've left the guild by then
+        self.started = asyncio.get_running_loop().time()
+        self.first_seen = discord.utils.utcnow()
+        self.timer: asyncio.Task | None = None
+
+    def describe(self) -> str:
+        mention = lambda cid: f"<#{cid}>"
+        steps = [] if self.channels[0] is None else [f"in {mention(self.channels[0])}"]
+        for prev, cur in zip(self.channels, self.channels[1:]):
+            if prev is None:
+                steps.append(f"joined {mention(cur)}")
+            elif cur is None:
+                steps.append("left")
+            else:
+                steps.append(f"moved {mention(cur)}")
+        return ' → '.join(steps)
+
+
 class Logging(commands.Cog, name="Logging", description="Configure server event logging"):
 
     def __init__(self, bot: Woolinator) -> None:
         self.bot: Woolinator = bot
         self._webhooks: dict[int, discord.Webhook] = {}
 
+        # Log embeds go through a DB-backed outbox, coalesced into messages of up to `batch_size` embeds
+        self.batch_delay = 2.0  # seconds to wait for more events before sending a batch
+        self.batch_size = 10  # Discord allows at most 10 embeds per message
+        self.retry_base = 5  # seconds; a failed send is retried after 5s, 10s, 20s, ...
+        self.max_attempts = 8
+        self.outbox = LogOutbox(self)
+
+        # guild_id -> {feature: channel_id}, mirrors the `channels` table so events never hit the DB
+        self._channels: dict[int, dict[str, int]] = {}
+
+        # guild_id -> ignored channel/category IDs as stored, and the same set expanded to every
+        # channel inside an ignored category (rebuilt lazily whenever the guild's channels change)
+        self._ignored: dict[int, frozenset[int]] = {}
+        self._ignored_resolved: dict[int, frozenset[int]] = {}
+
+        # guild_id -> (window, max_hold) in seconds, for guilds that changed them from the defaults
+        self._voice_debounce: dict[int, tuple[int, int]] = {}
+        # (guild_id, member_id) -> voice changes not logged yet
+        self._voice_trails: dict[tuple[int, int], VoiceTrail] = {}
+
+    async def cog_load(self):
+        async with self.bot.get_cursor() as cursor:
+            await cursor.execute("SELECT guild_id, feature, channel_id, webhook_id, webhook_token FROM channels")
+            rows = await cursor.fetchall()
+            await cursor.execute("SELECT guild_id, channel_id FROM ignored_log_channels")
+            ignored_rows = await cursor.fetchall()
+            await cursor.execute("SELECT guild_id, voice_log_window, voice_log_max_hold FROM guild_settings")
+            settings_rows = await cursor.fetchall()
+
+        for guild_id, feature, channel_id, webhook_id, webhook_token in rows:
+            self._channels.setdefault(guild_id, {})[feature] = channel_id
+            # Rehydrate stored webhooks without any REST calls; a stale one raises NotFound on first send
+            if webhook_id and webhook_token and channel_id not in self._webhooks:
+                self._webhooks[channel_id] = discord.Webhook.partial(webhook_id, webhook_token, client=self.bot)
+
+        ignored: dict[int, set[int]] = {}
+        for guild_id, channel_id in ignored_rows:
+            ignored.setdefault(guild_id, set()).add(channel_id)
+        self._ignored = {guild_id: frozenset(ids) for guild_id, ids in ignored.items()}
+
+        for guild_id, window, max_hold in settings_rows:
+            if (window, max_hold) != (VOICE_WINDOW_DEFAULT, VOICE_MAX_HOLD_DEFAULT):
+                self._voice_debounce[guild_id] = (window, max_hold)
+
+        self.outbox.start()
+
+    async def cog_unload(self):
+        await self.flush_logs()
+
     @property
     def emoji(self) -> discord.PartialEmoji:
         return discord.PartialEmoji(name="\U0001f4dd")
 
+    # --- Config cache ---
+
+    def cache_channel(self, guild_id: int, feature: str, channel_id: int | None) -> None:
+        """ Update the cached channel for a feature after it was written to the DB (`None` removes it). """
+        if channel_id is not None:
+            self._channels.setdefault(guild_id, {})[feature] = channel_id
+            return
+
+        config = self._channels.get(guild_id)
+        if config is not None:
+            config.pop(feature, None)
+            if not config:
+                del self._channels[guild_id]
+
+    def cache_ignored(self, guild_id: int, channel_ids: set[int] | frozenset[int]) -> None:
+        """ Replace the cached ignore list for a guild and drop its resolved set. """
+        if channel_ids:
+            self._ignored[guild_id] = frozenset(channel_ids)
+        else:
+            self._ignored.pop(guild_id, None)
+        self._ignored_resolved.pop(guild_id, None)
+
+    def _resolve_ignored(self, guild: discord.Guild) -> frozenset[int]:
+        """ Expand ignored categories into the channels they contain, so lookups are a single set test. """
+        resolved = self._ignored_resolved.get(guild.id)
+        if resolved is not None:
+            return resolved
+
+        ignored = self._ignored.get(guild.id, frozenset())
+        resolved = ignored.union(c.id for c in guild.channels if c.category_id in ignored)
+        self._ignored_resolved[guild.id] = resolved
+        return resolved
+
     # --- Database helpers ---
 
     async def get_log_channel(self, guild: discord.Guild | int, feature: str) -> int | None:
         """ Get snowflake channel ID for a log feature, `None` if it isn't set. """
         guild_id = guild.id if isinstance(guild, discord.Guild) else guild
-        async with self.bot.get_cursor() as cursor:
-            await cursor.execute("SELECT channel_id FROM channels WHERE feature = %s AND guild_id = %s", (feature, guild_id))
-            res = await cursor.fetchone()
-        return res[0] if res else None
+        return self._channels.get(guild_id, {}).get(feature)
 
     async def get_all_log_channels(self, guild_id: int) -> dict[str, int | None]:
         """ Map every known log feature to its configured channel ID (or `None`). """
-        config: dict[str, int | None] = {code: None for code in LOG_FEATURES}
-        async with self.bot.get_cursor() as cursor:
-            await cursor.execute("SELECT feature, channel_id FROM channels WHERE guild_id = %s", (guild_id,))
-            rows = await cursor.fetchall()
-        for feature, channel_id in rows:
-            if feature in config:
-                config[feature] = channel_id
-        return config
+        cached = self._channels.get(guild_id, {})
+        return {code: cached.get(code) for code in LOG_FEATURES}
 
     async def set_channel(self, guild_id: int, feature: str, channel_id: int) -> None:
+        # Reuse the webhook if another feature already logs to this channel
+        wh = self._webhooks.get(channel_id)
+        webhook_id, webhook_token = (wh.id, wh.token) if wh is not None else (None, None)
         async with self.bot.get_cursor() as cursor:
             await cursor.execute('''
-                    INSERT INTO channels (feature, guild_id, channel_id)
-                    VALUES (%s, %s, %s)
-                    ON DUPLICATE KEY UPDATE channel_id = %s
-                ''', (feature, guild_id, channel_id, channel_id))
+                    INSERT INTO channels (feature, guild_id, channel_id, webhook_id, webhook_token)
+                    VALUES (%s, %s, %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE channel_id = %s, webhook_id = %s, webhook_token = %s
+                ''', (feature, guild_id, channel_id, webhook_id, webhook_token, channel_id, webhook_id, webhook_token))
+        self.cache_channel(guild_id, feature, channel_id)
 
     async def remove_channel(self, guild_id: int, feature: str) -> None:
         async with self.bot.get_cursor() as cursor:
             await cursor.execute("DELETE FROM channels WHERE guild_id = %s AND feature = %s", (guild_id, feature))
+        self.cache_channel(guild_id, feature, None)
 
     async def remove_channel_by_id(self, guild_id: int, channel_id: int) -> None:
         """ Drop every feature config pointing at a (now-gone) channel. """
+        config = self._channels.get(guild_id, {})
+        if channel_id not in config.values():
+            return  # nothing configured for this channel, skip the DB round-trip
+
         async with self.bot.get_cursor() as cursor:
             await cursor.execute("DELETE FROM channels WHERE guild_id = %s AND channel_id = %s", (guild_id, channel_id))
+        for feature in [f for f, cid in config.items() if cid == channel_id]:
+            self.cache_channel(guild_id, feature, None)
 
     async def get_ignored_channels(self, guild_id: int) -> set[int]:
         """ Channels/categories whose messages should be excluded from message logs. """
-        async with self.bot.get_cursor() as cursor:
-            await cursor.execute("SELECT channel_id FROM ignored_log_channels WHERE guild_id = %s", (guild_id,))
-            rows = await cursor.fetchall()
-        return {row[0] for row in rows}
+        return set(self._ignored.get(guild_id, ()))
 
     async def set_ignored_channels(self, guild_id: int, channel_ids: list[int]) -> None:
         """ Replace the whole ignored-channel set for a guild with the given IDs. """
@@ -304,28 +644,27 @@ class Logging(commands.Cog, name="Logging", description="Configure server event
                     "INSERT INTO ignored_log_channels (guild_id, channel_id) VALUES (%s, %s)",
                     [(guild_id, cid) for cid in channel_ids],
                 )
+        self.cache_ignored(guild_id, set(channel_ids))
 
     async def remove_ignored_channel(self, guild_id: int, channel_id: int) -> None:
         """ Drop a single ignored entry (e.g. when its channel/category is deleted). """
+        ignored = self._ignored.get(guild_id, frozenset())
+        if channel_id not in ignored:
+            return
+
         async with self.bot.get_cursor() as cursor:
             await cursor.execute("DELETE FROM ignored_log_channels WHERE guild_id = %s AND channel_id = %s", (guild_id, channel_id))
+        self.cache_ignored(guild_id, ignored - {channel_id})
 
-    async def is_channel_ignored(self, guild_id: int, channel: discord.abc.GuildChannel | discord.Thread) -> bool:
+    def is_channel_ignored(self, channel: discord.abc.GuildChannel | discord.Thread) -> bool:
         """ True if the channel, its category, or its thread parent is on the ignore list. """
-        ignored = await self.get_ignored_channels(guild_id)
-        if not ignored:
+        if channel.guild.id not in self._ignored:
             return False
-        candidates = {channel.id}
-        parent = getattr(channel, "parent", None)
-        if parent is not None:
-            candidates.add(parent.id)
-            parent_category = getattr(parent, "category_id", None)
-            if parent_category:
-                candidates.add(parent_category)
-        category_id = getattr(channel, "category_id", None)
-        if category_id:
-            candidates.add(category_id)
-        return not candidates.isdisjoint(ignored)
+        ignored = self._resolve_ignored(channel.guild)
+        if channel.id in ignored:
+            return True
+        parent_id = getattr(channel, "parent_id", None)
+        return parent_id is not None and parent_id in ignored
 
     async def get_mod_log_setup_done(self, guild_id: int) -> bool:
         async with self.bot.get_cursor() as cursor:
@@ -341,10 +680,40 @@ class Logging(commands.Cog, name="Logging", description="Configure server event
                     ON DUPLICATE KEY UPDATE mod_log_setup_done = %s
                 ''', (guild_id, int(value), int(value)))
 
+    def get_voice_debounce(self, guild_id: int) -> tuple[int, int]:
+        """ The (window, max hold) in seconds used to group a guild's voice log entries. """
+        return self._voice_debounce.get(guild_id, (VOICE_WINDOW_DEFAULT, VOICE_MAX_HOLD_DEFAULT))
+
+    async def set_voice_debounce(self, guild_id: int, window: int, max_hold: int) -> None:
+        async with self.bot.get_cursor() as cursor:
+            await cursor.execute('''
+                    INSERT INTO guild_settings (guild_id, voice_log_window, voice_log_max_hold)
+                    VALUES (%s, %s, %s)
+                    ON DUPLICATE KEY UPDATE voice_log_window = %s, voice_log_max_hold = %s
+                ''', (guild_id, window, max_hold, window, max_hold))
+        self._voice_debounce[guild_id] = (window, max_hold)
+
+    async def store_webhook(self, channel: discord.TextChannel, wh: discord.Webhook | None) -> None:
+        """ Persist (or clear, if `None`) the webhook on every config row for the channel. """
+        if wh is None:
+            self._webhooks.pop(channel.id, None)
+        else:
+            self._webhooks[channel.id] = wh
+
+        if channel.id not in self._channels.get(channel.guild.id, {}).values():
+            return  # e.g. an auto-created mod log whose config isn't written yet
+
+        async with self.bot.get_cursor() as cursor:
+            await cursor.execute('''
+                    UPDATE channels
+                    SET webhook_id = %s, webhook_token = %s
+                    WHERE guild_id = %s AND channel_id = %s
+                ''', (wh and wh.id, wh and wh.token, channel.guild.id, channel.id))
+
     # --- Sending ---
 
     async def _get_webhook(self, channel: discord.TextChannel) -> discord.Webhook | None:
-        """ Get (or lazily create + cache) a bot-owned webhook for the channel. """
+        """ Get (or lazily create + store) a bot-owned webhook for the channel. """
         cached = self._webhooks.get(channel.id)
         if cached is not None:
             return cached
@@ -354,8 +723,8 @@ class Logging(commands.Cog, name="Logging", description="Configure server event
 
         try:
             for wh in await channel.webhooks():
-                if wh.user and wh.user.id == self.bot.user.id:
-                    self._webhooks[channel.id] = wh
+                if wh.user and wh.user.id == self.bot.user.id and wh.token:
+                    await self.store_webhook(channel, wh)
                     return wh
 
             avatar = None
@@ -365,26 +734,34 @@ class Logging(commands.Cog, name="Logging", description="Configure server event
                 pass
 
             wh = await channel.create_webhook(name="Woolinator Logs", avatar=avatar, reason="Logging webhook")
-            self._webhooks[channel.id] = wh
+            await self.store_webhook(channel, wh)
             return wh
         except discord.HTTPException:
             return None
 
-    async def _send_via_webhook(self, channel: discord.TextChannel, embed: discord.Embed, view: ui.View | None = None) -> bool:
-        """ Send a log embed through a webhook, falling back to a normal message. """
+    async def _send_via_webhook(self, channel: discord.TextChannel, embeds: list[discord.Embed], view: ui.View | None = None, file: discord.File | None = None) -> bool:
+        """ Send log embeds (max 10) through a webhook, falling back to a normal message. """
+        extra = {}
+        if view is not None:
+            extra["view"] = view
+        if file is not None:
+            extra["file"] = file
+
         wh = await self._get_webhook(channel)
         if wh is not None:
-            kwargs = dict(embed=embed, username=self.bot.user.name, avatar_url=self.bot.user.display_avatar.url)
+            kwargs = dict(embeds=embeds, username=self.bot.user.name, avatar_url=self.bot.user.display_avatar.url, **extra)
             if view is not None:
-                kwargs["view"] = view
                 kwargs["wait"] = True
             try:
                 await wh.send(**kwargs)
                 return True
             except discord.NotFound:
-                self._webhooks.pop(channel.id, None)
+                # Webhook was deleted - forget it so a new one gets created (and stored)
+                await self.store_webhook(channel, None)
                 wh = await self._get_webhook(channel)
                 if wh is not None:
+                    if file is not None:
+                        file.reset()
                     try:
                         await wh.send(**kwargs)
                         return True
@@ -393,17 +770,42 @@ class Logging(commands.Cog, name="Logging", description="Configure server event
             except discord.HTTPException:
                 pass
 
+        if file is not None:
+            file.reset()
         try:
-            if view is not None:
-                await channel.send(embed=embed, view=view)
-            else:
-                await channel.send(embed=embed)
+            await channel.send(embeds=embeds, **extra)
             return True
         except discord.HTTPException:
             return False
 
-    async def send_log(self, guild: discord.Guild, feature: str, embed: discord.Embed, view: ui.View | None = None) -> bool:
-        """ Send a log embed to the configured channel for a feature, if set. """
+    async def _enqueue(self, channel: discord.TextChannel, embed: discord.Embed, jump_url: str | None = None, file: tuple[str, str] | None = None) -> bool:
+        payload = {"embed": embed.to_dict()}
+        if jump_url is not None:
+            payload["jump_url"] = jump_url
+        if file is not None:
+            payload["file"] = {"filename": file[0], "content": file[1]}
+        try:
+            await self.outbox.put(channel.guild.id, channel.id, payload)
+        except Exception:
+            log.exception("Failed to store a log entry for channel %s", channel.id)
+            return False
+        return True
+
+    async def flush_logs(self) -> None:
+        """ Write out held voice trails, then stop the outbox after a final delivery attempt (used on shutdown). """
+        for key, trail in list(self._voice_trails.items()):
+            if trail.timer is not None:
+                trail.timer.cancel()
+            await self._send_voice_trail(key)
+        await self.outbox.stop()
+
+    async def send_log(self, guild: discord.Guild, feature: str, embed: discord.Embed, jump_url: str | None = None, file: tuple[str, str] | None = None) -> bool:
+        """ Queue a log embed for the configured channel of a feature, if set.
+
+        `jump_url` adds a "Jump to Message" button; `file` is a (filename, text) attachment.
+        Returns True once the entry is stored in the outbox, not sent: it's delivered shortly after, and
+        retried if that fails. False means there's no channel to log to, or the entry couldn't be stored.
+        """
         channel_id = await self.get_log_channel(guild, feature)
         if channel_id is None:
             return False
@@ -419,19 +821,22 @@ class Logging(commands.Cog, name="Logging", description="Configure server event
             except discord.HTTPException:
                 return False  # transient failure - leave the config intact
 
-        return await self._send_via_webhook(channel, embed, view)
+        return await self._enqueue(channel, embed, jump_url, file)
 
     # --- Mod log entry point (called by the Moderation cog) ---
 
     async def handle_mod_log(self, guild: discord.Guild, embed: discord.Embed) -> bool:
-        """ Send a mod-log embed, auto-creating the channel on first use if needed. """
+        """ Queue a mod-log embed, auto-creating the channel on first use if needed.
+
+        Like `send_log`, True means the entry was queued for delivery rather than already sent.
+        """
         embed.timestamp=discord.utils.utcnow()
         channel_id = await self.get_log_channel(guild, "log-mod-actions")
         if channel_id is None:
             channel = await self.maybe_auto_create_mod_log(guild)
             if channel is None:
                 return False
-            return await self._send_via_webhook(channel, embed)
+            return await self._enqueue(channel, embed)
         return await self.send_log(guild, "log-mod-actions", embed)
 
     async def maybe_auto_create_mod_log(self, guild: discord.Guild) -> discord.TextChannel | None:
@@ -482,18 +887,32 @@ class Logging(commands.Cog, name="Logging", description="Configure server event
 
     # --- Event listeners ---
 
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        if channel.category_id in self._ignored.get(channel.guild.id, ()):
+            self._ignored_resolved.pop(channel.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        if before.category_id != after.category_id and after.guild.id in self._ignored:
+            self._ignored_resolved.pop(after.guild.id, None)
+
     @commands.Cog.listener()
     async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
         """ Clean up any log/feature configs when their channel is deleted. """
         self._webhooks.pop(channel.id, None)
+        self._ignored_resolved.pop(channel.guild.id, None)
         await self.remove_channel_by_id(channel.guild.id, channel.id)
         await self.remove_ignored_channel(channel.guild.id, channel.id)
 
     @commands.Cog.listener()
-    async def on_message_delete(self, message: discord.Message):
-        if message.guild is None or message.author.bot:
+    async def on_cached_message_delete(self, message: CachedMessage):
+        """ Dispatched by the bot for any deleted message still in its compact message cache. """
+        if message.author_bot:
             return
-        if await self.is_channel_ignored(message.guild.id, message.channel):
+        guild = self.bot.get_guild(message.guild_id)
+        channel = guild.get_channel_or_thread(message.channel_id) if guild else None
+        if channel is None or self.is_channel_ignored(channel):
             return
 
         embed = discord.Embed(
@@ -501,18 +920,51 @@ class Logging(commands.Cog, name="Logging", description="Configure server event
             colour=0xf93838,
             timestamp=message.created_at,
         )
-        embed.set_author(name=f"@{message.author.name}", icon_url=message.author.display_avatar.url)
-        embed.add_field(name="Channel", value=message.channel.mention, inline=True)
+        embed.set_author(name=f"@{message.author_name}", icon_url=message.author_avatar)
+        embed.add_field(name="Channel", value=channel.mention, inline=True)
         if message.attachments:
-            embed.add_field(name="Attachments", value='\n'.join(f"- {a.filename}" for a in message.attachments), inline=False)
-        embed.set_footer(text=f"Message Deleted • User ID: {message.author.id}")
-        await self.send_log(message.guild, "log-messages", embed)
+            embed.add_field(name="Attachments", value='\n'.join(f"- {filename}" for filename, _ in message.attachments), inline=False)
+        embed.set_footer(text=f"Message Deleted • User ID: {message.author_id}")
+        await self.send_log(guild, "log-messages", embed)
+
+    @commands.Cog.listener()
+    async def on_cached_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent, cached: list[CachedMessage]):
+        """ Purges & Discord's bulk deletes: one summary embed with a transcript of the cached messages. """
+        guild = self.bot.get_guild(payload.guild_id) if payload.guild_id else None
+        if guild is None or await self.get_log_channel(guild, "log-messages") is None:
+            return
+        channel = guild.get_channel_or_thread(payload.channel_id)
+        if channel is None or self.is_channel_ignored(channel):
+            return
+
+        messages = sorted((m for m in cached if not m.author_bot), key=lambda m: m.id)
+        total = len(payload.message_ids)
+
+        lines = []
+        for m in messages:
+            lines.append(f"[{m.created_at:%Y-%m-%d %H:%M:%S} UTC] @{m.author_name} ({m.author_id}): {m.content}")
+            if m.attachments:
+                lines.append(f"    Attachments: {', '.join(filename for filename, _ in m.attachments)}")
+
+        embed = discord.Embed(
+            description=f"**{total:,}** message{'' if total == 1 else 's'} deleted in {channel.mention}",
+            colour=0xf93838,
+            timestamp=discord.utils.utcnow(),
+        )
+        embed.set_author(name="Bulk Message Delete", icon_url=getattr(guild.icon, "url", None))
+        if len(cached) < total:
+            embed.add_field(name="Not cached", value=f"{total - len(cached):,} message(s) had no stored content", inline=False)
+        embed.set_footer(text=f"Bulk Delete • Channel ID: {channel.id}")
+
+        file = (f"deleted-messages-{channel.id}.txt", '\n'.join(lines)) if lines else None
+        await self.send_log(guild, "log-messages", embed, file=file)
 
     @commands.Cog.listener()
-    async def on_message_edit(self, before: discord.Message, after: discord.Message):
-        if after.guild is None or after.author.bot or before.content == after.content:
+    async def on_cached_message_edit(self, before: CachedMessage, after: discord.Message):
+        """ Dispatched by the bot when a message in its compact message cache has its content edited. """
+        if after.guild is None or after.author.bot:
             return
-        if await self.is_channel_ignored(after.guild.id, after.channel):
+        if self.is_channel_ignored(after.channel):
             return
 
         embed = discord.Embed(colour=0xff8d42, timestamp=after.edited_at or discord.utils.utcnow())
@@ -522,23 +974,70 @@ class Logging(commands.Cog, name="Logging", description="Configure server event
         embed.add_field(name="Channel", value=after.channel.mention, inline=True)
         embed.set_footer(text=f"Message Edited • User ID: {after.author.id}")
 
-        view = ui.View()
-        view.add_item(ui.Button(style=discord.ButtonStyle.link, label="Jump to Message", url=after.jump_url))
-        await self.send_log(after.guild, "log-messages", embed, view=view)
+        await self.send_log(after.guild, "log-messages", embed, jump_url=after.jump_url)
 
     @commands.Cog.listener()
     async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
         if member.bot or before.channel == after.channel:
             return
+        if await self.get_log_channel(member.guild, "log-voice") is None:
+            return
+
+        window, max_hold = self.get_voice_debounce(member.guild.id)
+        key = (member.guild.id, member.id)
+        trail = self._voice_trails.get(key)
+        before_id, after_id = before.channel and before.channel.id, after.channel and after.channel.id
+        if trail is None:
+            # A change on its own is logged straight away; only the ones quickly following it are held
+            if window:
+                trail = self._voice_trails[key] = VoiceTrail(after_id, member)
+                trail.timer = asyncio.create_task(self._voice_trail_timer(key, window))
+            await self._send_voice_change(member, before_id, after_id)
+            return
 
-        if before.channel is None:
-            action, detail, colour = "joined", after.channel.mention, 0x83f590
-        elif after.channel is None:
-            action, detail, colour = "left", before.channel.mention, 0xf93838
+        if trail.timer is not None:
+            trail.timer.cancel()
+        if len(trail.channels) == 1:
+            # The first held change starts the hold time
+            trail.started = asyncio.get_running_loop().time()
+            trail.first_seen = discord.utils.utcnow()
+        trail.member = member
+        trail.channels.append(after_id)
+
+        # Wait for `window` seconds of quiet, but never hold the trail past `max_hold`
+        remaining = trail.started + max(max_hold, window) - asyncio.get_running_loop().time()
+        trail.timer = asyncio.create_task(self._voice_trail_timer(key, max(min(window, remaining), 0)))
+
+    async def _voice_trail_timer(self, key: tuple[int, int], delay: float):
+        await asyncio.sleep(delay)
+        await self._send_voice_trail(key)
+
+    async def _send_voice_trail(self, key: tuple[int, int]):
+        trail = self._voice_trails.pop(key, None)
+        if trail is None or len(trail.channels) == 1:
+            return  # nothing held since the last log
+        guild = self.bot.get_guild(key[0]) or trail.member.guild
+        member = guild.get_member(key[1]) or trail.member
+
+        if len(trail.channels) == 2:
+            await self._send_voice_change(member, *trail.channels, when=trail.first_seen)
+            return
+
+        embed = discord.Embed(description=trail.describe(), colour=ACCENT, timestamp=trail.first_seen)
+        embed.set_author(name=f"@{member.name} hopped between voice channels", icon_url=member.display_avatar.url)
+        embed.set_footer(text=f"Voice Activity • {len(trail.channels) - 1} changes • User ID: {member.id}")
+        await self.send_log(guild, "log-voice", embed)
+
+    async def _send_voice_change(self, member: discord.Member, before_id: int | None, after_id: int | None, when: datetime | None = None):
+        """ Log a single join/move/leave between two voice channel IDs (`None` = not in voice). """
+        if before_id is None:
+            action, detail, colour = "joined", f"<#{after_id}>", 0x83f590
+        elif after_id is None:
+            action, detail, colour = "left", f"<#{before_id}>", 0xf93838
         else:
-            action, detail, colour = "moved", f"{before.channel.mention} → {after.channel.mention}", ACCENT
+            action, detail, colour = "moved", f"<#{before_id}> → <#{after_id}>", ACCENT
 
-        embed = discord.Embed(description=f"**Channel:** {detail}", colour=colour, timestamp=discord.utils.utcnow())
+        embed = discord.Embed(description=f"**Channel:** {detail}", colour=colour, timestamp=when or discord.utils.utcnow())
         embed.set_author(name=f"@{member.name} {action} a voice channel", icon_url=member.display_avatar.url)
         embed.set_footer(text=f"Voice {action.capitalize()} • User ID: {member.id}")
         await self.send_log(member.guild, "log-voice", embed)
@@ -566,26 +1065,49 @@ class Logging(commands.Cog, name="Logging", description="Configure server event
 
     @commands.Cog.listener()
     async def on_member_update(self, before: discord.Member, after: discord.Member):
-        if before.nick != after.nick:
+        nick_changed = before.nick != after.nick
+        added, removed = role_diff(before, after)
+        roles_changed = bool(added or removed)
+        if not nick_changed and not roles_changed:
+            return
+
+        nick_channel = await self.get_log_channel(after.guild, "log-nicknames") if nick_changed else None
+        roles_channel = await self.get_log_channel(after.guild, "log-roles") if roles_changed else None
+
+        # Both changes going to the same channel -> one combined entry
+        if nick_channel is not None and nick_channel == roles_channel:
+            embed = discord.Embed(colour=0xff8d42, timestamp=discord.utils.utcnow())
+            embed.set_author(name=f"@{after.name}'s nickname & roles updated", icon_url=after.display_avatar.url)
+            self._add_nick_fields(embed, before, after)
+            self._add_role_fields(embed, added, removed)
+            embed.set_footer(text=f"Member Updated • User ID: {after.id}")
+            await self.send_log(after.guild, "log-nicknames", embed)
+            return
+
+        if nick_channel is not None:
             embed = discord.Embed(colour=0xff8d42, timestamp=discord.utils.utcnow())
             embed.set_author(name=f"@{after.name} changed nickname", icon_url=after.display_avatar.url)
-            embed.add_field(name="Before", value=trim_str(rmd(before.nick), 1024) if before.nick else "*None*", inline=True)
-            embed.add_field(name="After", value=trim_str(rmd(after.nick), 1024) if after.nick else "*None*", inline=True)
+            self._add_nick_fields(embed, before, after)
             embed.set_footer(text=f"Nickname Changed • User ID: {after.id}")
             await self.send_log(after.guild, "log-nicknames", embed)
 
-        added = [r for r in after.roles if r not in before.roles]
-        removed = [r for r in before.roles if r not in after.roles]
-        if added or removed:
+        if roles_channel is not None:
             embed = discord.Embed(colour=ACCENT, timestamp=discord.utils.utcnow())
             embed.set_author(name=f"@{after.name}'s roles updated", icon_url=after.display_avatar.url)
-            if added:
-                embed.add_field(name="Added", value=trim_str(', '.join(r.mention for r in added), 1024), inline=False)
-            if removed:
-                embed.add_field(name="Removed", value=trim_str(', '.join(r.mention for r in removed), 1024), inline=False)
+            self._add_role_fields(embed, added, removed)
             embed.set_footer(text=f"Roles Updated • User ID: {after.id}")
             await self.send_log(after.guild, "log-roles", embed)
 
+    def _add_nick_fields(self, embed: discord.Embed, before: discord.Member, after: discord.Member) -> None:
+        embed.add_field(name="Before", value=trim_str(rmd(before.nick), 1024) if before.nick else "*None*", inline=True)
+        embed.add_field(name="After", value=trim_str(rmd(after.nick), 1024) if after.nick else "*None*", inline=True)
+
+    def _add_role_fields(self, embed: discord.Embed, added: list[discord.Role], removed: list[discord.Role]) -> None:
+        if added:
+            embed.add_field(name="Added", value=trim_str(', '.join(r.mention for r in added), 1024), inline=False)
+        if removed:
+            embed.add_field(name="Removed", value=trim_str(', '.join(r.mention for r in removed), 1024), inline=False)
+
     # --- Command ---
 
     @commands.hybrid_command(name="logging", description="Configure server logging channels")
@@ -17,6 +17,7 @@ from .utils.common import trim_str, plur
 from .utils.context import Context
 from .utils.views import GlobalGuildSwitchView, GuildInfoView, handle_view_edit
 from .utils.emojis import Emojis
+from .utils.message_cache import CachedMessage
 from bot import Woolinator
 
 
@@ -141,8 +142,8 @@ class Misc(commands.Cog, name="Miscellaneous", description="Uncategorised stuff"
         self.ctx_count = app_commands.ContextMenu(name="Word & Character Count", callback=self.ctx_menu_count)
         self.bot.tree.add_command(self.ctx_count)
 
-        self.deleted_messages: dict[int, discord.Message] = {}
-        self.edited_messages: dict[int, tuple[discord.Message, discord.Message]] = {}
+        self.deleted_messages: dict[int, CachedMessage] = {}
+        self.edited_messages: dict[int, tuple[CachedMessage, CachedMessage]] = {}
 
     async def cog_load(self):
         if not self.rotate_status.is_running(): self.rotate_status.start()
@@ -172,14 +173,12 @@ class Misc(commands.Cog, name="Miscellaneous", description="Uncategorised stuff"
     # --- Listeners ---
 
     @commands.Cog.listener()
-    async def on_message_delete(self, message: discord.Message):
-        if message.guild:
-            self.deleted_messages[message.channel.id] = message
+    async def on_cached_message_delete(self, message: CachedMessage):
+        self.deleted_messages[message.channel_id] = message
 
     @commands.Cog.listener()
-    async def on_message_edit(self, before: discord.Message, after: discord.Message):
-        if after.guild and before.content != after.content:
-            self.edited_messages[before.channel.id] = (before, after)
+    async def on_cached_message_edit(self, before: CachedMessage, after: discord.Message):
+        self.edited_messages[before.channel_id] = (before, CachedMessage(after))
 
     # --- Commands ---
 
@@ -260,8 +259,12 @@ class Misc(commands.Cog, name="Miscellaneous", description="Uncategorised stuff"
             await cursor.execute("SELECT prefix FROM prefixes WHERE entity_id = %s AND is_guild = 0", (user.id,))
             prefix_row = await cursor.fetchone()
 
+            await cursor.execute("SELECT timezone FROM user_settings WHERE user_id = %s", (user.id,))
+            settings_row = await cursor.fetchone()
+
         tag_total = sum(count for _, count in tag_guilds)
-        has_data = bool(reminder_count or birthday_guilds or tag_guilds or (prefix_row and prefix_row[0]))
+        has_data = bool(reminder_count or birthday_guilds or tag_guilds or (prefix_row and prefix_row[0])
+                        or (settings_row and settings_row[0]))
 
         lines = []
 
@@ -289,6 +292,10 @@ class Misc(commands.Cog, name="Miscellaneous", description="Uncategorised stuff"
         if prefix_row and prefix_row[0]:
             lines.append(f"⌨️ Your personal prefix is `{prefix_row[0]}`: {self.bot.cmd_mention('prefix')}")
 
+        # Timezone used by reminders
+        if settings_row and settings_row[0]:
+            lines.append(f"🌍 Your timezone is `{settings_row[0]}`: {self.bot.cmd_mention('timezone')}")
+
 
         embed = discord.Embed(title="Your data", description='\n\n'.join(lines), colour=0xffe3be)
         embed.set_author(name=f"@{user.name}", icon_url=user.display_avatar.url)
@@ -306,14 +313,19 @@ class Misc(commands.Cog, name="Miscellaneous", description="Uncategorised stuff"
             await cursor.execute("DELETE FROM birthdays WHERE user_id = %s", (user_id,))
             await cursor.execute("DELETE FROM tags WHERE user_id = %s", (user_id,))
             await cursor.execute("DELETE FROM prefixes WHERE entity_id = %s AND is_guild = 0", (user_id,))
+            await cursor.execute("DELETE FROM user_settings WHERE user_id = %s", (user_id,))
 
-        # Cancel any pending in-memory reminder timers so deleted reminders don't still fire
+        # Unschedule any reminders already loaded in memory so deleted reminders don't still fire
         reminder_cog = self.bot.get_cog("Reminders")
         if reminder_cog is not None:
             for rid in reminder_ids:
-                task = reminder_cog.asyncio_timers.pop(rid, None)
-                if task is not None:
-                    task.cancel()
+                reminder_cog.scheduler.cancel(rid)
+            reminder_cog.timezones.pop(user_id, None)
+
+        tags_cog = self.bot.get_cog("Tags")
+        if tags_cog is not None:
+            tags_cog.names.remove_owner(user_id)
+            tags_cog.cache.pop_where(lambda key, tag: tag.user_id == user_id)
 
         # Drop the cached personal prefix so it stops applying immediately
         self.bot.user_prefixes.pop(user_id, None)
@@ -335,13 +347,13 @@ class Misc(commands.Cog, name="Miscellaneous", description="Uncategorised stuff"
             return
         
         embed = discord.Embed(description=m.content, timestamp=m.created_at, colour=0xf93838)
-        embed.set_author(name=f"@{m.author.name}", icon_url=m.author.display_avatar.url)
+        embed.set_author(name=f"@{m.author_name}", icon_url=m.author_avatar)
 
-        if m.stickers:
-            embed.set_image(url=m.stickers[0].url)
+        if m.sticker_url:
+            embed.set_image(url=m.sticker_url)
 
         if m.attachments:
-            a = [f"- [{a.filename}]({a.proxy_url})" for a in m.attachments]
+            a = [f"- [{filename}]({proxy_url})" for filename, proxy_url in m.attachments]
             embed.add_field(name="Attachments", value='\n'.join(a))
 
         await ctx.reply(embed=embed)
@@ -359,7 +371,7 @@ class Misc(commands.Cog, name="Miscellaneous", description="Uncategorised stuff"
         embed = discord.Embed(timestamp=after.created_at, colour=0xff8d42)
         embed.add_field(name="Before:", value=trim_str(before.content, 1024), inline=False)
         embed.add_field(name="After:", value=trim_str(after.content, 1024), inline=False)
-        embed.set_author(name=f"@{after.author.name}", icon_url=after.author.display_avatar.url)
+        embed.set_author(name=f"@{after.author_name}", icon_url=after.author_avatar)
 
         view = ui.View()\
             .add_item(ui.Button(style=discord.ButtonStyle.link, label="Jump to Message", url=after.jump_url))
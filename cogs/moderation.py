@@ -1,5 +1,8 @@
-from typing import Literal, Callable, Any
+from typing import Literal, Callable
 import logging
+import asyncio
+import time
+import re
 from datetime import timedelta
 
 import discord
@@ -12,11 +15,16 @@ from .utils.views import YesOrNo
 from .utils.emojis import tick
 from .utils.common import parse_entered_duration, format_timedelta, trim_str, hybrid_msg_edit, plur
 from .utils.context import Context
+from .utils.regex_process import RegexProcess
 from bot import Woolinator
 
 
 log = logging.getLogger(__name__)
 
+LINK_RE = re.compile(r"https?://\S+")
+PURGE_REGEX_MAX_LENGTH = 200
+PURGE_REGEX_TIMEOUT = 2.0  # seconds to check each page of 100 messages against a regex, before its process is killed
+
 
 class Moderation(commands.Cog, name="Moderation", description="Tools to help moderate"):
 
@@ -52,11 +60,81 @@ class Moderation(commands.Cog, name="Moderation", description="Tools to help mod
         """ Send a mod log embed, delegating to the Logging cog (handles auto-creation).
 
         Returns:
-            bool: True if the message was sent successfully, False otherwise.
+            bool: True if the message was queued for delivery (it's sent shortly after, with retries),
+            False if there's no mod log channel to send it to.
         """
         cog = self.bot.get_cog("Logging")
         return await cog.handle_mod_log(guild, embed) if cog else False
 
+    def compile_purge_filter(self, flags: "Moderation.PurgeFlags", ignore_id: int) -> Callable[[discord.Message], bool]:
+        """ Turn the purge flags, other than the regex, into a single function deciding whether a message should be deleted.
+
+        Each check captures its flag's value up front, and the combining loop stops at the first check
+        that decides the result. The regex is checked separately, in its own process.
+        """
+        checks: list[Callable[[discord.Message], bool]] = []
+
+        if flags.bot:
+            checks.append(lambda m: (m.webhook_id is None or m.interaction is not None) and m.author.bot)
+
+        if flags.user:
+            user_id = flags.user.id
+            checks.append(lambda m: m.author.id == user_id)
+
+        if flags.attachments:
+            checks.append(lambda m: bool(m.attachments))
+
+        if flags.embeds:
+            checks.append(lambda m: bool(m.embeds))
+
+        if flags.mentions:
+            checks.append(lambda m: bool(m.mentions or m.role_mentions or m.mention_everyone))
+
+        if flags.contains:
+            contains = flags.contains
+            checks.append(lambda m: contains in m.content)
+
+        if flags.prefix:
+            prefix = flags.prefix
+            checks.append(lambda m: m.content.startswith(prefix))
+
+        if flags.suffix:
+            suffix = flags.suffix
+            checks.append(lambda m: m.content.endswith(suffix))
+
+        if flags.links:
+            search_link = LINK_RE.search
+            checks.append(lambda m: search_link(m.content) is not None)
+
+        require_all = flags.require == "all"
+
+        if not checks:
+            if flags.regex and not require_all:
+                return lambda m: False  # only the regex can match
+            return lambda m: m.id != ignore_id
+
+        if len(checks) == 1:
+            check = checks[0]
+            return lambda m: m.id != ignore_id and check(m)
+
+        checks = tuple(checks)
+        if require_all:
+            def matches(m: discord.Message) -> bool:
+                if m.id == ignore_id: return False  # the message that invoked the command
+                for check in checks:
+                    if not check(m):
+                        return False
+                return True
+        else:
+            def matches(m: discord.Message) -> bool:
+                if m.id == ignore_id: return False
+                for check in checks:
+                    if check(m):
+                        return True
+                return False
+
+        return matches
+
     # --- Commands ---
 
     class PurgeFlags(commands.FlagConverter, delimiter=' ', prefix='-', case_insensitive=True):
@@ -89,13 +167,33 @@ class Moderation(commands.Cog, name="Moderation", description="Tools to help mod
             description="Include messages from bots", default=False
         )
 
+        regex: str | None = commands.flag(
+            description="Include messages that match this regular expression", aliases=['re'], default=None
+        )
+
+        attachments: bool = commands.flag(
+            description="Include messages with attachments", aliases=['files'], default=False
+        )
+
+        embeds: bool = commands.flag(
+            description="Include messages with embeds", default=False
+        )
+
+        links: bool = commands.flag(
+            description="Include messages with links", default=False
+        )
+
+        mentions: bool = commands.flag(
+            description="Include messages that mention a user or role", default=False
+        )
+
         require: Literal["any", "all"] = commands.flag(
             description="Whether any or all of the flags should be met. Default: 'all'",
             aliases=['r'], default="all",
         )
 
     @commands.hybrid_command(name="purge", description="Delete messages in bulk with customisable filters", extras={
-        "examples": ["100 -bot yes -c hello there", "50 -u @spammer", "200 -b 123456789"],
+        "examples": ["100 -bot yes -c hello there", "50 -u @spammer", "200 -b 123456789", "100 -links yes -attachments yes -r any"],
     })
     @commands.bot_has_permissions(manage_messages=True, read_message_history=True)
     @checks.hybrid_has_permissions(manage_messages=True)
@@ -112,6 +210,11 @@ class Moderation(commands.Cog, name="Moderation", description="Tools to help mod
         `-after (-a) [MESSAGE ID]` - The message ID to include messages that come after
         `-before (-b) [MESSAGE ID]` - The message ID to include messages that come before
         `-bot` - Whether to include messages from bots
+        `-regex (-re) [PATTERN]` - The regular expression to include messages that match
+        `-attachments (-files)` - Whether to include messages with attachments
+        `-embeds` - Whether to include messages with embeds
+        `-links` - Whether to include messages with links
+        `-mentions` - Whether to include messages that mention a user or role
         `-require (-r) [any/all]` (default:all) - Whether any or all of the flags should be met
         
         You can use as many flags as you like.
@@ -120,64 +223,145 @@ class Moderation(commands.Cog, name="Moderation", description="Tools to help mod
         `?purge 100 -bot 1 -c hello there -b 123456789` will search the last 100 messages and delete all those that are sent from a bot, before the message with the ID '123456789', and contains the text 'hello there'
         """
 
-        await ctx.defer(ephemeral=True)
-
-        predicates: list[Callable[[discord.Message], Any]] = []
-        if flags.bot:
-            predicates.append(lambda m: (m.webhook_id is None or m.interaction is not None) and m.author.bot)
-
-        if flags.user:
-            predicates.append(lambda m: m.author == flags.user)
+        if flags.regex:
+            if len(flags.regex) > PURGE_REGEX_MAX_LENGTH:
+                return await ctx.reply(f"The regex can't be longer than {PURGE_REGEX_MAX_LENGTH} characters.", ephemeral=True)
+            try:
+                re.compile(flags.regex)
+            except re.error as e:
+                return await ctx.reply(f"Invalid regex: {e}", ephemeral=True)
 
-        if flags.contains:
-            predicates.append(lambda m: flags.contains in m.content)
+        await ctx.defer(ephemeral=True)
 
-        if flags.prefix:
-            predicates.append(lambda m: m.content.startswith(flags.prefix))
+        matches = self.compile_purge_filter(flags, ctx.message.id)
+        require_all = flags.require == "all"
+        regex: RegexProcess | None = None
 
-        if flags.suffix:
-            predicates.append(lambda m: m.content.endswith(flags.suffix))
+        status = await ctx.reply("Searching for messages...", ephemeral=True)
 
+        # Bulk deletes only work on messages from the last 14 days, so the scan stops at the first older
+        # message (or, when going forwards from `-after`, starts at the 14 day mark)
         threshold = discord.utils.utcnow() - timedelta(days=14)
-        predicates.append(lambda m: m.created_at >= threshold)
-
-        op = all if flags.require == "all" else any
-
-        def predicate(m: discord.Message) -> bool:
-            if m.id == ctx.message.id: return False  # ignore the message that invoked command
-            r = op(p(m) for p in predicates)
-            return r
-
-        before = discord.Object(id=flags.before) if flags.before else None
+        before = discord.Object(id=flags.before) if flags.before else status
         after = discord.Object(id=flags.after) if flags.after else None
-        if before is None and ctx.interaction is not None:
-            before = await ctx.interaction.original_response()
-
-        amount = amount if ctx.interaction else (amount + 1)
+        if after is not None:
+            after = discord.Object(id=max(after.id, discord.utils.time_snowflake(threshold)))
+
+        # Matches are deleted 100 at a time while the scan carries on; the queue is bounded so a slow
+        # delete holds the scan back rather than piling up messages
+        queue: asyncio.Queue[discord.Message | None] = asyncio.Queue(maxsize=200)
+        scanned = deleted = 0
+        delete_error: discord.HTTPException | None = None
+
+        async def deleter() -> None:
+            nonlocal deleted, delete_error
+            chunk: list[discord.Message] = []
+            while True:
+                message = await queue.get()
+                if message is not None:
+                    chunk.append(message)
+                if chunk and (len(chunk) == 100 or message is None):
+                    if delete_error is None:
+                        try:
+                            await ctx.channel.delete_messages(chunk, reason=f"Purge command ran by {ctx.author.name} ({ctx.author.id})")
+                            deleted += len(chunk)
+                        except discord.HTTPException as e:
+                            delete_error = e  # keep draining the queue so the scan never blocks
+                    chunk = []
+                if message is None:
+                    return
+
+        async def queue_matches(batch: list[discord.Message]) -> None:
+            nonlocal scanned
+            if regex is None:
+                found = [m for m in batch if matches(m)]
+            elif require_all:
+                # Only messages that pass the other flags are sent to the regex
+                candidates = [m for m in batch if matches(m)]
+                found = [candidates[i] for i in await regex.matching([m.content for m in candidates])] if candidates else []
+            else:
+                found, rest = [], []
+                for m in batch:
+                    if matches(m):
+                        found.append(m)
+                    elif m.id != ctx.message.id:
+                        rest.append(m)
+                if rest:
+                    found += [rest[i] for i in await regex.matching([m.content for m in rest])]
+            scanned += len(batch)
+            for m in found:
+                await queue.put(m)
+
+        def progress() -> str:
+            return f"Purging... searched {scanned}/{amount} message{plur(amount)}, deleted {deleted}"
+
+        limit = amount if ctx.interaction else (amount + 1)  # + the invoking message, which is skipped
+        too_old = False
+        scan_error = None
+        task = asyncio.create_task(deleter())
+        last_progress = time.monotonic()
+        batch: list[discord.Message] = []
         try:
-            deleted = [msg async for msg in ctx.channel.history(limit=amount, before=before, after=after) if predicate(msg)]
+            if flags.regex:
+                # In a separate process, which is killed if the regex takes too long
+                regex = RegexProcess(flags.regex, PURGE_REGEX_TIMEOUT)
+                await regex.start()
+
+            async for msg in ctx.channel.history(limit=limit, before=before, after=after):
+                if msg.created_at < threshold:
+                    too_old = True
+                    break
+
+                # Filtered a page at a time, which is also how history arrives
+                batch.append(msg)
+                if len(batch) < 100:
+                    continue
+                await queue_matches(batch)
+                batch = []
+                if delete_error is not None:
+                    break
+
+                if time.monotonic() - last_progress >= 2:
+                    last_progress = time.monotonic()
+                    await hybrid_msg_edit(status, progress())
+
+            if batch and delete_error is None:
+                await queue_matches(batch)
+        except TimeoutError:
+            scan_error = "The regex took too long to check messages, so the purge was stopped."
+        except RuntimeError:
+            scan_error = "The regex couldn't be checked, so the purge was stopped."
         except discord.Forbidden:
-            return await ctx.reply("I do not have permissions to search for messages.")
+            scan_error = "I do not have permissions to search for messages."
         except discord.HTTPException as e:
-            return await ctx.reply(f"Error: {e} (try a smaller search?)")
+            scan_error = f"Error: {e} (try a smaller search?)"
+        finally:
+            if regex is not None:
+                await regex.close()
+            await queue.put(None)
+            await task
+
+        if delete_error is not None:
+            await hybrid_msg_edit(status, f"Error while deleting: {delete_error} (deleted {deleted} message{plur(deleted)})")
+        elif scan_error is not None:
+            await hybrid_msg_edit(status, f"{scan_error} (deleted {deleted} message{plur(deleted)})" if deleted else scan_error)
+        elif deleted == 0:
+            await hybrid_msg_edit(status, "No messages found to delete." + (" Messages older than 14 days can't be purged." if too_old else ""))
+        else:
+            note = " Stopped at messages older than 14 days, which can't be purged." if too_old else ""
+            await hybrid_msg_edit(status, f"Done! Deleted {deleted} message{plur(deleted)}.{note}")
 
-        if len(deleted) == 0:
-            return await ctx.reply("No messages found to delete.", ephemeral=True)
+        if ctx.interaction is None:
+            await status.delete(delay=10)
+            if deleted:
+                await ctx.react()
 
-        for chunk in discord.utils.as_chunks(deleted, 100):
-            try:
-                await ctx.channel.delete_messages(chunk, reason=f"Purge command ran by {ctx.author.name} ({ctx.author.id})")
-            except discord.HTTPException as e:
-                return await ctx.reply(f"Error while deleting: {e}")
-        
-        if ctx.interaction is not None:
-            await ctx.reply("Done!", ephemeral=True)
-        else:
-            await ctx.react()
+        if deleted == 0:
+            return
 
         # Send to mod log channel
         embed = discord.Embed(
-            description=f"**Channel:** {ctx.channel.mention}\n**Moderator:** `@{ctx.author.name}` ({ctx.author.mention})\n**Messages deleted:** {len(deleted)}",
+            description=f"**Channel:** {ctx.channel.mention}\n**Moderator:** `@{ctx.author.name}` ({ctx.author.mention})\n**Messages deleted:** {deleted}",
             colour=0x9a61ff
         )
         embed.set_author(name="Messages Purged", icon_url=ctx.author.display_avatar.url)
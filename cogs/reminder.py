@@ -1,16 +1,19 @@
 from datetime import timedelta, datetime, timezone
+from zoneinfo import ZoneInfo, available_timezones
+import heapq
 import logging
 
 import asyncio
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands, ui
 from dateutil.relativedelta import relativedelta
 
 from bot import Woolinator
 from .utils.views import handle_view_edit
 from .utils.context import Context
-from .utils.common import parse_entered_duration, trim_str
+from .utils.common import parse_entered_time, parse_recurrence, describe_recurrence, trim_str, plur, RECURRENCE_MIN_GAP
+from .utils.recurrence_process import expand_recurrence
 
 
 log = logging.getLogger(__name__)
@@ -18,18 +21,18 @@ log = logging.getLogger(__name__)
 
 class RemindersRemoveView(ui.View):
 
-    def __init__(self, reminders: list):
+    def __init__(self, reminders: list, start: int = 1):
         super().__init__(timeout=60)
         self.reminders_to_remove = []
 
-        self.add_item(RemindersRemoveDropdown(reminders=reminders))
+        self.add_item(RemindersRemoveDropdown(reminders=reminders, start=start))
 
 
 class RemindersRemoveDropdown(ui.Select):
 
-    def __init__(self, reminders: list):
+    def __init__(self, reminders: list, start: int = 1):
         options = []
-        for i, reminder in enumerate(reminders, start=1):
+        for i, reminder in enumerate(reminders, start=start):
             _id = reminder[0]
             #time_created = reminder[1]
             #time_expire = reminder[2]
@@ -47,53 +50,124 @@ class RemindersRemoveDropdown(ui.Select):
 
 
 class RemindersListView(ui.View):
+    """ Pages through a user's reminders, fetching one page at a time.
 
-    def __init__(self, author_id: int, reminders, bot: Woolinator, asyncio_timers: dict, timeout: int = 20):
+    Pages are read with keyset pagination on `(time_created, id)`, so each page costs one index range
+    scan however many reminders there are. `cursors` holds the key each visited page starts after.
+    """
+
+    def __init__(self, author: discord.abc.User, bot: Woolinator, scheduler: "ReminderScheduler",
+                 page_size: int = 10, timeout: int = 60):
         super().__init__(timeout=timeout)
         self.bot: Woolinator = bot
-        self.author_id = author_id
-        self.reminders = reminders
-        self.reminders_to_remove = []
+        self.author = author
+        self.author_id = author.id
+        self.scheduler = scheduler
+        self.page_size = page_size  # at most 25, the embed field and select option limit
         self.message = None
-        self.asyncio_timers = asyncio_timers
 
-    @ui.button(label="Delete reminder(s)", emoji="\U0001f5d1", style=discord.ButtonStyle.red)
-    async def delete_reminder(self, interaction: discord.Interaction, button: ui.Button):
-        view = RemindersRemoveView(reminders=self.reminders)
-        await interaction.response.send_message("Please select the reminder(s) you want to delete:", view=view, ephemeral=True)
-        await view.wait()
-        await interaction.delete_original_response()
+        self.page = 0
+        self.cursors: list[tuple[datetime, int] | None] = [None]
+        self.reminders: list[tuple] = []
+        self.has_next = False
 
+    async def fetch_page(self) -> None:
+        cursor_key = self.cursors[self.page]
+        async with self.bot.get_cursor() as cursor:
+            if cursor_key is None:
+                await cursor.execute('''
+                        SELECT id, time_created, time_expire, content, recurrence
+                        FROM reminders
+                        WHERE user_id = %s
+                        ORDER BY time_created, id
+                        LIMIT %s
+                    ''', (self.author_id, self.page_size + 1))
+            else:
+                await cursor.execute('''
+                        SELECT id, time_created, time_expire, content, recurrence
+                        FROM reminders
+                        WHERE user_id = %s AND (time_created > %s OR (time_created = %s AND id > %s))
+                        ORDER BY time_created, id
+                        LIMIT %s
+                    ''', (self.author_id, cursor_key[0], cursor_key[0], cursor_key[1], self.page_size + 1))
+            rows = await cursor.fetchall()
+
+        # The extra row only tells whether there is a next page
+        self.has_next = len(rows) > self.page_size
+        self.reminders = list(rows[:self.page_size])
+        self.update_button_states()
+
+    def build_embed(self) -> discord.Embed:
         embed = discord.Embed(colour=discord.Colour.random())
-        embed.set_author(name=interaction.user.name + "'s reminders", icon_url=interaction.user.display_avatar.url)
-        for i, reminder in enumerate(self.reminders, start=1):
-            _id = reminder[0]
-            if _id in view.reminders_to_remove: continue
-            time_created = reminder[1]
-            time_expire = reminder[2]
+        embed.set_author(name=self.author.name + "'s reminders", icon_url=self.author.display_avatar.url)
+        for i, reminder in enumerate(self.reminders, start=self.page * self.page_size + 1):
+            ts_created = round(reminder[1].replace(tzinfo=timezone.utc).timestamp())
+            ts_expire = round(reminder[2].replace(tzinfo=timezone.utc).timestamp())
             content = trim_str(reminder[3], 900)
+            repeats = f"\nRepeats: {describe_recurrence(reminder[4])}" if reminder[4] else ''
 
             embed.add_field(name=f"Reminder #{i}",
-                            value=f"Created: <t:{round(time_created.timestamp())}:F>\nExpires: <t:{round(time_expire.timestamp())}:F> (<t:{round(time_expire.timestamp())}:R>)\nContent: {content}",
+                            value=f"Created: <t:{ts_created}:F>\nExpires: <t:{ts_expire}:f> (<t:{ts_expire}:R>){repeats}\nContent: {content}",
                             inline=False)
 
-        await interaction.message.edit(embed=embed)
+        if not self.reminders:
+            embed.description = "You have no reminders set... breh"
+        return embed
+
+    def update_button_states(self) -> None:
+        self.prev_button.disabled = self.page == 0
+        self.page_counter.label = f"Page {self.page + 1}"
+        self.next_button.disabled = not self.has_next
+        self.delete_reminder.disabled = not self.reminders
+
+    @ui.button(label="Previous", style=discord.ButtonStyle.blurple)
+    async def prev_button(self, interaction: discord.Interaction, button: ui.Button):
+        self.page -= 1
+        await self.fetch_page()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    @ui.button(label="Page 1", style=discord.ButtonStyle.gray)
+    async def page_counter(self, interaction: discord.Interaction, button: ui.Button):
+        await interaction.response.send_message("This button doesn't do anything :stuck_out_tongue_winking_eye:", ephemeral=True)
+
+    @ui.button(label="Next", style=discord.ButtonStyle.blurple)
+    async def next_button(self, interaction: discord.Interaction, button: ui.Button):
+        last = self.reminders[-1]
+        del self.cursors[self.page + 1:]
+        self.cursors.append((last[1], last[0]))
+        self.page += 1
+        await self.fetch_page()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
 
-        async with self.bot.get_cursor() as cursor:
-            for reminder_id in view.reminders_to_remove:
-                await cursor.execute("DELETE FROM reminders WHERE id = %s AND user_id = %s", (reminder_id, interaction.user.id))
+    @ui.button(label="Delete reminder(s)", emoji="\U0001f5d1", style=discord.ButtonStyle.red)
+    async def delete_reminder(self, interaction: discord.Interaction, button: ui.Button):
+        view = RemindersRemoveView(reminders=self.reminders, start=self.page * self.page_size + 1)
+        await interaction.response.send_message("Please select the reminder(s) you want to delete:", view=view, ephemeral=True)
+        await view.wait()
+        await interaction.delete_original_response()
 
-                task: asyncio.Task|None = self.asyncio_timers.get(reminder_id, None)
-                if task:
-                    del self.asyncio_timers[reminder_id]
-                    task.cancel()
+        ids = view.reminders_to_remove
+        if not ids:
+            return
+        async with self.bot.get_cursor() as cursor:
+            await cursor.execute(f"DELETE FROM reminders WHERE user_id = %s AND id IN ({', '.join(['%s'] * len(ids))})",
+                                 (interaction.user.id, *ids))
+        for reminder_id in ids:
+            self.scheduler.cancel(reminder_id)
+
+        # Reload the page, stepping back if it was the last one and is now empty
+        await self.fetch_page()
+        while not self.reminders and self.page > 0:
+            self.page -= 1
+            await self.fetch_page()
+        await interaction.message.edit(embed=self.build_embed(), view=self)
 
     async def on_timeout(self) -> None:
-        button = self.children[0]  # only one button
-        button.disabled = True
+        for item in self.children:
+            item.disabled = True
 
         await handle_view_edit(self.message, view=self)
-        
+
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         if self.author_id and interaction.user.id != self.author_id:
             await interaction.response.send_message("Not your button to press .-.", ephemeral=True)
@@ -101,57 +175,387 @@ class RemindersListView(ui.View):
         return True
 
 
+class ReminderScheduler:
+    """ A single task that fires reminders in expiry order from a min-heap.
+
+    Only reminders expiring within the next `window` are held in memory; the following window is
+    read from the `idx_time_expire` index once time reaches it. Cancelling just forgets the
+    reminder, and its heap entry is skipped when it comes up.
+    """
+
+    def __init__(self, cog: "Reminder", window: timedelta = timedelta(hours=1)):
+        self.cog = cog
+        self.bot: Woolinator = cog.bot
+        self.window = window
+
+        self._heap: list[tuple[datetime, int]] = []  # (time_expire, id)
+        self._reminders: dict[int, tuple] = {}  # id -> row, for reminders still due to fire
+        self._loaded_until: datetime | None = None  # everything expiring before this is in the heap
+        self._loading_until: datetime | None = None  # boundary of the window being read right now
+        self._cancelled_while_loading: set[int] = set()  # IDs the window being read may still return
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._reminders)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="reminder-scheduler")
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    def schedule(self, reminder: tuple) -> None:
+        """ Add a reminder row if it falls inside the loaded window; later ones are loaded with their window. """
+        id: int = reminder[0]
+        time_expire: datetime = reminder[3]
+        # While a window is being read, reminders added inside it are taken now: the read may have
+        # already missed their row, and the window's boundary moves past them once it finishes
+        boundary = self._loading_until or self._loaded_until
+        if boundary is None or time_expire.replace(microsecond=0) >= boundary:
+            return
+        if id in self._reminders:
+            return
+
+        self._reminders[id] = reminder
+        heapq.heappush(self._heap, (time_expire, id))
+        if self._heap[0][1] == id:
+            self._wake.set()  # new earliest reminder, re-arm the sleep
+
+    def cancel(self, reminder_id: int) -> None:
+        self.cog.delivery.cancel(reminder_id)  # in case it's already due and waiting to be sent
+        if self._loading_until is not None:
+            self._cancelled_while_loading.add(reminder_id)  # the read may have seen the row before it was deleted
+        if self._reminders.pop(reminder_id, None) is None:
+            return
+        # Drop cancelled entries in one go once they make up most of the heap
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._reminders):
+            self._heap = [entry for entry in self._heap if entry[1] in self._reminders]
+            heapq.heapify(self._heap)
+
+    async def _load_window(self, now: datetime) -> None:
+        # DATETIME columns have no fractional seconds, so keep the boundary on a whole second
+        until = (now + self.window).replace(microsecond=0)
+        self._loading_until = until
+        try:
+            rows = await self._read_window(until)
+        finally:
+            self._loading_until = None
+            cancelled, self._cancelled_while_loading = self._cancelled_while_loading, set()
+
+        self._loaded_until = until
+        for row in rows:
+            if row[0] in cancelled:
+                continue
+            # Stored datetimes are UTC wall time
+            recur_until = row[8].replace(tzinfo=timezone.utc) if row[8] is not None else None
+            self.schedule((row[0], row[1], row[2].replace(tzinfo=timezone.utc), row[3].replace(tzinfo=timezone.utc),
+                           *row[4:8], recur_until, row[9]))
+
+    async def _read_window(self, until: datetime) -> list[tuple]:
+        async with self.bot.get_cursor() as cursor:
+            if self._loaded_until is None:
+                # First load also picks up everything that became overdue while the bot was offline
+                await cursor.execute('''
+                        SELECT id, user_id, time_created, time_expire, content, is_dm, link, recurrence, recur_until, recur_left
+                        FROM reminders
+                        WHERE time_expire < %s
+                    ''', (until,))
+            else:
+                await cursor.execute('''
+                        SELECT id, user_id, time_created, time_expire, content, is_dm, link, recurrence, recur_until, recur_left
+                        FROM reminders
+                        WHERE time_expire >= %s AND time_expire < %s
+                    ''', (self._loaded_until, until))
+            return await cursor.fetchall()
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        while True:
+            self._wake.clear()
+            now = discord.utils.utcnow()
+
+            if self._loaded_until is None or now >= self._loaded_until:
+                try:
+                    await self._load_window(now)
+                except Exception:
+                    log.exception("Failed to load upcoming reminders, retrying in 30 seconds")
+                    await asyncio.sleep(30)
+                    continue
+
+            # Heap order hands the delivery queue an overdue backlog oldest-first
+            while self._heap and self._heap[0][0] <= now:
+                _, id = heapq.heappop(self._heap)
+                reminder = self._reminders.pop(id, None)
+                if reminder is not None:
+                    self.cog.delivery.put(reminder)
+
+            next_at = self._heap[0][0] if self._heap else self._loaded_until
+            next_at = min(next_at, self._loaded_until)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=max((next_at - discord.utils.utcnow()).total_seconds(), 0))
+            except asyncio.TimeoutError:
+                pass
+
+
+class ReminderDelivery:
+    """ A fixed pool of workers sending due reminders in the order they were queued.
+
+    At most `concurrency` reminders are being resolved and sent at once, so a backlog after downtime
+    is worked through steadily instead of every lookup and send hitting the REST API together.
+    Each channel (or DM) also gets a send budget of `rate` messages per `per` seconds.
+
+    Delivered reminders are acknowledged into a buffer that is deleted from the database in one
+    statement every `flush_delay` seconds, or as soon as `flush_size` IDs are waiting.
+    """
+
+    def __init__(self, cog: "Reminder", concurrency: int = 4, rate: int = 5, per: float = 5.0,
+                 flush_delay: float = 0.25, flush_size: int = 100):
+        self.cog = cog
+        self.bot: Woolinator = cog.bot
+        self.concurrency = concurrency
+        self.rate = rate
+        self.per = per
+        self.flush_delay = flush_delay
+        self.flush_size = flush_size
+
+        self.queue: asyncio.Queue[tuple] = asyncio.Queue()
+        self._workers: list[asyncio.Task] = []
+        self._acked: list[int] = []  # delivered reminder IDs not yet deleted
+        self._flush_wake = asyncio.Event()
+        self._flusher: asyncio.Task | None = None
+        self._budgets: dict[tuple[str, int], commands.Cooldown] = {}  # ("channel" | "dm", id) -> bucket
+        self._pending: set[int] = set()  # IDs queued or being sent
+        self._cancelled: set[int] = set()  # pending IDs deleted since they were queued
+
+        # Metrics
+        self.in_flight = 0
+        self.delivered = 0
+        self.failed = 0
+        self.last_lag = 0.0  # seconds between a reminder expiring and a worker picking it up
+        self.max_lag = 0.0
+
+    def start(self) -> None:
+        self._workers = [asyncio.create_task(self._worker(), name=f"reminder-delivery-{i}") for i in range(self.concurrency)]
+        self._flusher = asyncio.create_task(self._run_flusher(), name="reminder-ack-flusher")
+
+    async def stop(self) -> None:
+        """ Stop the workers and delete whatever was delivered but not yet flushed. """
+        for task in self._workers:
+            task.cancel()
+        self._workers = []
+        if self._flusher is not None:
+            # Waited for, so IDs taken by a flush it was in the middle of are back in the buffer first
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+
+    def put(self, reminder: tuple) -> None:
+        self._pending.add(reminder[0])
+        self.queue.put_nowait(reminder)
+
+    def cancel(self, reminder_id: int) -> None:
+        """ Stop a queued reminder from being sent; one already being sent may still go out. """
+        if reminder_id in self._pending:
+            self._cancelled.add(reminder_id)
+
+    def is_cancelled(self, reminder_id: int) -> bool:
+        return reminder_id in self._cancelled
+
+    def ack(self, reminder_id: int) -> None:
+        """ Mark a reminder as delivered; its row is deleted with the next flush. """
+        self._acked.append(reminder_id)
+        if len(self._acked) >= self.flush_size:
+            self._flush_wake.set()
+
+    async def flush(self) -> None:
+        if not self._acked:
+            return
+        ids, self._acked = self._acked, []
+        try:
+            async with self.bot.get_cursor() as cursor:
+                await cursor.execute(f"DELETE FROM reminders WHERE id IN ({', '.join(['%s'] * len(ids))})", ids)
+        except BaseException:
+            self._acked.extend(ids)  # try again with the next flush, including after being cancelled
+            raise
+
+    async def _run_flusher(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_wake.wait(), timeout=self.flush_delay)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_wake.clear()
+            try:
+                await self.flush()
+            except Exception:
+                log.exception("Failed to delete delivered reminders")
+
+    async def wait_for_budget(self, kind: str, id: int) -> None:
+        """ Wait until the channel or DM with this ID can take another message. """
+        key = (kind, id)
+        bucket = self._budgets.get(key)
+        if bucket is None:
+            if len(self._budgets) > 1000:
+                # Forget buckets that have fully refilled, they're equivalent to new ones
+                self._budgets = {k: b for k, b in self._budgets.items() if b.get_tokens() < b.rate}
+            bucket = self._budgets[key] = commands.Cooldown(self.rate, self.per)
+
+        while retry_after := bucket.update_rate_limit():
+            await asyncio.sleep(retry_after)
+
+    def metrics(self) -> dict[str, int | float]:
+        return {
+            "queued": self.queue.qsize(),
+            "pending_ack": len(self._acked),
+            "in_flight": self.in_flight,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "last_lag": self.last_lag,
+            "max_lag": self.max_lag,
+        }
+
+    async def _worker(self):
+        while True:
+            reminder = await self.queue.get()
+            lag = (discord.utils.utcnow() - reminder[3]).total_seconds()
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+
+            if self.is_cancelled(reminder[0]):
+                self._pending.discard(reminder[0])
+                self._cancelled.discard(reminder[0])
+                self.queue.task_done()
+                continue
+
+            self.in_flight += 1
+            try:
+                try:
+                    await self.cog.handle_reminder_expiration(reminder)
+                    self.delivered += 1
+                except Exception:
+                    self.failed += 1
+                    log.exception(f"Failed to deliver reminder {reminder[0]}")
+                # Failures are finished too, the row would otherwise be retried on every restart. A worker
+                # cancelled mid-send never gets here, so that reminder is delivered again next start
+                if not self.is_cancelled(reminder[0]):
+                    await self.finish(reminder)
+            finally:
+                self._pending.discard(reminder[0])
+                self._cancelled.discard(reminder[0])
+                self.in_flight -= 1
+                self.queue.task_done()
+
+    async def finish(self, reminder: tuple) -> None:
+        """ Move a recurring reminder on to its next occurrence, otherwise acknowledge it for deletion. """
+        next_reminder = await self.cog.next_occurrence(reminder)
+        if next_reminder is None:
+            self.ack(reminder[0])
+            return
+
+        try:
+            async with self.bot.get_cursor() as cursor:
+                updated = await cursor.execute(
+                    "UPDATE reminders SET time_expire = %s, recur_left = %s WHERE id = %s",
+                    (next_reminder[3], next_reminder[9], next_reminder[0]))
+        except Exception:
+            log.exception(f"Failed to move reminder {reminder[0]} to its next occurrence")
+            return
+
+        # Nothing updated means the reminder was deleted while it was being delivered
+        if updated:
+            self.cog.scheduler.schedule(next_reminder)
+
+
 class Reminder(commands.Cog, name="Reminders", description="Never forget a thing again"):
 
     def __init__(self, bot: Woolinator) -> None:
         self.bot: Woolinator = bot
+        self.scheduler = ReminderScheduler(self)
+        self.delivery = ReminderDelivery(self)
+        self.timezones: dict[int, ZoneInfo] = {}  # user_id -> their timezone, if they set one
+        self._timezone_names: list[str] | None = None
 
-        self.update_interval = 10  # minutes
+    async def cog_load(self):
+        async with self.bot.get_cursor() as cursor:
+            await cursor.execute("SELECT user_id, timezone FROM user_settings WHERE timezone IS NOT NULL")
+            rows = await cursor.fetchall()
+
+        for user_id, tz in rows:
+            try:
+                self.timezones[user_id] = ZoneInfo(tz)
+            except (ValueError, KeyError):
+                log.warning(f"Ignoring unknown timezone '{tz}' of user {user_id}")
 
-        self.asyncio_timers: dict[int, asyncio.Task] = {}
-        self.sync_asyncio_timers.change_interval(minutes=self.update_interval)
-        if not self.sync_asyncio_timers.is_running():
-            self.sync_asyncio_timers.start()
+        self.delivery.start()
+        self.scheduler.start()
 
     async def cog_unload(self):
-        for task in self.asyncio_timers.values():
-            task.cancel()
-        self.asyncio_timers.clear()
-        self.sync_asyncio_timers.cancel()
+        self.scheduler.stop()
+        await self.delivery.stop()
 
     @property
     def emoji(self) -> discord.PartialEmoji:
         return discord.PartialEmoji(name="\U000023f0")
 
-    # --- Tasks ---
+    # --- Helpers ---
+
+    async def next_occurrence(self, reminder: tuple) -> tuple | None:
+        """ The reminder moved on to its next occurrence, or None if it doesn't repeat (anymore). """
+
+        rule: str | None = reminder[7]
+        until: datetime | None = reminder[8]
+        left: int | None = reminder[9]
+        if rule is None:
+            return None
+
+        if left is not None:
+            if left <= 1:
+                return None
+            left -= 1
+
+        # The rule is followed in the user's own timezone, so BYDAY/BYHOUR keep their local meaning across DST
+        tz = self.timezones.get(reminder[1], timezone.utc)
+        time_expire: datetime = reminder[3].astimezone(tz)
+
+        # Occurrences missed while the bot was offline are skipped, rather than all sent at once
+        try:
+            upcoming = await expand_recurrence(rule, time_expire, max(time_expire, discord.utils.utcnow()), 1)
+        except ValueError:
+            log.warning(f"Reminder {reminder[0]} has an invalid recurrence rule: {rule}")
+            return None
+        except TimeoutError:
+            log.warning(f"Reminder {reminder[0]} has a recurrence rule that took too long to work out: {rule}")
+            return None
+        next_at = upcoming[0] if upcoming else None
+
+        if next_at is None or (until is not None and next_at > until):
+            return None
+        return (*reminder[:3], next_at, *reminder[4:8], until, left)
+
+    async def create_reminder(self, ctx: Context, when: datetime, what: str, recurrence: str | None = None,
+                              recur_until: datetime | None = None, recur_left: int | None = None) -> None:
+        now = discord.utils.utcnow()
+        is_dm_channel = isinstance(ctx.channel, discord.DMChannel)
 
-    @tasks.loop(minutes=10)
-    async def sync_asyncio_timers(self):
-        # Stored datetimes are UTC wall time, so compare against plain UTC
         async with self.bot.get_cursor() as cursor:
             await cursor.execute('''
-                    SELECT id, user_id, time_created, time_expire, content, is_dm, link
-                    FROM reminders
-                    WHERE time_expire < %s
-                ''', (discord.utils.utcnow() + timedelta(minutes=self.update_interval),))
-            reminders = await cursor.fetchall()
-
-        for reminder in reminders:
-            id: int = reminder[0]
-
-            # Don't touch/cancel tasks that are still sleeping or mid-delivery
-            existing = self.asyncio_timers.get(id)
-            if existing is not None and not existing.done():
-                continue
+                    INSERT INTO reminders (user_id, time_created, time_expire, content, is_dm, link, recurrence, recur_until, recur_left)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ''', (ctx.author.id, now, when, what, is_dm_channel, ctx.message.jump_url, recurrence, recur_until, recur_left))
+            await cursor.execute("SELECT LAST_INSERT_ID()")
+            id = (await cursor.fetchone())[0]
 
-            self.asyncio_timers[id] = asyncio.create_task(self.handle_reminder_expiration(reminder))
-
-    # --- Helpers ---
+        self.scheduler.schedule((id, ctx.author.id, now, when, what, is_dm_channel, ctx.message.jump_url,
+                                 recurrence, recur_until, recur_left))
 
     async def handle_reminder_expiration(self, reminder: tuple):
         time_expire: datetime = reminder[3].replace(tzinfo=timezone.utc)
-        await asyncio.sleep(max((time_expire - discord.utils.utcnow()).total_seconds(), 0))
-
         id: int = reminder[0]
         user_id: str = reminder[1]
         time_created: datetime = reminder[2].replace(tzinfo=timezone.utc)
@@ -182,39 +586,82 @@ class Reminder(commands.Cog, name="Reminders", description="Never forget a thing
                         is_dm = True  # left guild
                     else:
                         channel = await self.bot.get_or_fetch_channel(guild, int(msg_details[-2]))
-                        try:
-                            await channel.send(message, view=view)
-                        except (discord.Forbidden, discord.HTTPException):
-                            failed_to_send = True
+                        if channel is None:
+                            failed_to_send = True  # channel was deleted
+                        else:
+                            await self.delivery.wait_for_budget("channel", channel.id)
+                            if self.delivery.is_cancelled(id):
+                                return
+                            try:
+                                await channel.send(message, view=view)
+                            except (discord.Forbidden, discord.HTTPException):
+                                failed_to_send = True
                 else:
                     is_dm = True  # guild no longer exists
             if is_dm or failed_to_send:
+                await self.delivery.wait_for_budget("dm", user.id)
+                if self.delivery.is_cancelled(id):
+                    return
                 try:
                     await user.send(message, view=view)
                 except (discord.Forbidden, discord.HTTPException):
                     pass
 
-        # Delete only after delivery was attempted, so a restart or cancellation
-        # mid-send doesn't silently lose the reminder
-        async with self.bot.get_cursor() as cursor:
-            await cursor.execute("DELETE FROM reminders WHERE id = %s", (id,))
+    async def timezone_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
+        if self._timezone_names is None:
+            self._timezone_names = sorted(available_timezones())
 
-        self.asyncio_timers.pop(id, None)
+        current = current.lower().replace(' ', '_')
+        return [app_commands.Choice(name=name, value=name) for name in self._timezone_names if current in name.lower()][:25]
 
     # --- Commands ---
 
+    @commands.hybrid_command(name="timezone", aliases=["tz"], description="Set the timezone used for dates and times in reminders", extras={
+        "examples": ["Europe/London", "America/New_York", "reset"],
+    })
+    @app_commands.describe(timezone="Your timezone, e.g. 'Europe/London'; 'reset' to go back to UTC")
+    @app_commands.autocomplete(timezone=timezone_autocomplete)
+    async def timezone(self, ctx: Context, timezone: commands.Range[str, 1, 64] | None = None):
+        if timezone is None:
+            tz = self.timezones.get(ctx.author.id)
+            return await ctx.reply(f"Your timezone is **{tz.key if tz else 'UTC'}**", ephemeral=True)
+
+        if timezone.lower() == "reset":
+            async with self.bot.get_cursor() as cursor:
+                await cursor.execute("UPDATE user_settings SET timezone = NULL WHERE user_id = %s", (ctx.author.id,))
+            self.timezones.pop(ctx.author.id, None)
+            return await ctx.reply("Your timezone has been reset to UTC", ephemeral=True)
+
+        try:
+            tz = ZoneInfo(timezone.replace(' ', '_'))
+        except (ValueError, KeyError):
+            return await ctx.reply(f"Unknown timezone: {trim_str(timezone, 32)}\nUse a name like 'Europe/London' or 'America/New_York'.", ephemeral=True)
+
+        async with self.bot.get_cursor() as cursor:
+            await cursor.execute('''
+                    INSERT INTO user_settings (user_id, timezone)
+                    VALUES (%s, %s)
+                    ON DUPLICATE KEY UPDATE timezone = VALUES(timezone)
+                ''', (ctx.author.id, tz.key))
+        self.timezones[ctx.author.id] = tz
+
+        local_now = discord.utils.utcnow().astimezone(tz)
+        await ctx.reply(f"Your timezone is now **{tz.key}** (it's {local_now.strftime('%H:%M')} there)", ephemeral=True)
+
     @commands.hybrid_command(name="remindme", aliases=["reminder"], description="Set a reminder", extras={
-        "examples": ["10m take a break", "7d,5h finish the project"],
+        "examples": ["10m take a break", "7d,5h finish the project", "\"tomorrow 9am\" call the bank"],
     })
     @commands.cooldown(4, 10.5, commands.BucketType.user)  # each reminder can send 2 messages
-    @app_commands.describe(when="When you want to be reminded; e.g., '1d, 10 days, 5secs' (separated by comma)",
+    @app_commands.describe(when="When you want to be reminded; e.g., '1d, 10 days, 5secs', 'tomorrow 9am', '2026-12-25 18:00'",
                            what="What you want to be reminded of")
     async def remindme(self, ctx: Context, when: commands.Range[str, 2, 50], *,
                        what: commands.Range[str, 1, 1234] = "...nothing?"):
 
+        """ Times of day and dates are in your timezone, if you've set one with the timezone command. """
+
         what = await commands.clean_content(use_nicknames=False).convert(ctx, what)
         now = discord.utils.utcnow()
-        duration, invalid_formats, too_long = parse_entered_duration(when)
+        when, invalid_formats, too_long = parse_entered_time(when, now, self.timezones.get(ctx.author.id))
 
         if invalid_formats or too_long:
 
@@ -238,62 +685,93 @@ class Reminder(commands.Cog, name="Reminders", description="Never forget a thing
 
             return await ctx.reply('\n\n'.join([invalid_message, too_long_message]), ephemeral=True)
 
-        when = now + duration
+        if when <= now:
+            return await ctx.reply("that's in the past... I can't time travel (yet)", ephemeral=True)
 
         if when > now + relativedelta(years=5, seconds=1):
             if when > now + relativedelta(years=20):
                 return await ctx.reply("now that's just WAYYY too far into the future...", ephemeral=True)
             return await ctx.reply("that's too far into the future... please try less than 5 years!", ephemeral=True)
 
-        is_dm_channel = isinstance(ctx.channel, discord.DMChannel)
+        await self.create_reminder(ctx, when, what)
+        await ctx.reply(f"Okay dokey, <t:{round(when.timestamp())}:R>: {what}", ephemeral=False)
 
-        async with self.bot.get_cursor() as cursor:
-            await cursor.execute('''
-                    INSERT INTO reminders (user_id, time_created, time_expire, content, is_dm, link)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                ''', (ctx.author.id, now, when, what, is_dm_channel, ctx.message.jump_url))
-            await cursor.execute("SELECT LAST_INSERT_ID()")
-            id = (await cursor.fetchone())[0]
+    class RecurringFlags(commands.FlagConverter, delimiter=' ', prefix='-', case_insensitive=True):
 
-        remaining_time = when - now
-        if remaining_time.total_seconds() < float(self.update_interval * 60):
-            task = asyncio.create_task(
-                self.handle_reminder_expiration((id, ctx.author.id, now, when, what, is_dm_channel, ctx.message.jump_url)),
-                name=f"reminder-{id}")
-            self.asyncio_timers[id] = task
+        what: commands.Range[str, 1, 1234] = commands.flag(
+            description="What you want to be reminded of", positional=True, default="...nothing?"
+        )
 
-        await ctx.reply(f"Okay dokey, <t:{round(when.timestamp())}:R>: {what}", ephemeral=False)
+        until: commands.Range[str, 2, 50] | None = commands.flag(
+            description="Stop repeating after this long or at this time; e.g., '30d', '2026-12-31'", aliases=['u'], default=None
+        )
+
+        count: commands.Range[int, 1, 1000] | None = commands.flag(
+            description="Stop after reminding you this many times", aliases=['c'], default=None
+        )
+
+    @commands.hybrid_command(name="remindevery", aliases=["recurring"], description="Set a recurring reminder", extras={
+        "examples": ["1d drink water", "2w water the plants -count 6", "FREQ=WEEKLY;BYDAY=MO,FR stand-up -until 3 months"],
+    })
+    @commands.cooldown(4, 10.5, commands.BucketType.user)
+    @app_commands.describe(every="How often; e.g., '1d', '2 weeks', or an RRULE such as 'FREQ=WEEKLY;BYDAY=MO,FR'")
+    async def remindevery(self, ctx: Context, every: commands.Range[str, 2, 100], *, flags: RecurringFlags):
+        """ Only one reminder is stored, and moved on to its next time whenever it goes off.
+
+        `every` is a duration like `remindme` takes (at least 5 minutes), or an iCalendar RRULE without COUNT or UNTIL.
+        The following flags (+ aliases) go after what you want to be reminded of:
+        `-until (-u) [duration/date]` - Stop repeating after this long, or at this date
+        `-count (-c) [number]` - Stop after reminding you this many times
+        """
+
+        what = await commands.clean_content(use_nicknames=False).convert(ctx, flags.what)
+        now = discord.utils.utcnow()
+        tz = self.timezones.get(ctx.author.id)
+        local_now = now.astimezone(tz or timezone.utc)
+
+        invalid = f"Invalid recurrence: {trim_str(every, 30)}\nTry something like '1d' or '2 weeks' (at least 5 minutes apart), or an RRULE without COUNT/UNTIL."
+        recurrence = parse_recurrence(every, local_now)
+        if recurrence is None:
+            return await ctx.reply(invalid, ephemeral=True)
+
+        recur_until = None
+        if flags.until:
+            recur_until, invalid_formats, too_long = parse_entered_time(flags.until, now, tz)
+            if recur_until is None or recur_until <= now:
+                return await ctx.reply(f"Invalid end time: {trim_str(flags.until, 15)}", ephemeral=True)
+
+        try:
+            upcoming = await expand_recurrence(recurrence, local_now, local_now, 10)
+        except TimeoutError:
+            return await ctx.reply("That rule took too long to work out; it might (almost) never happen.", ephemeral=True)
+
+        when = upcoming[0] if upcoming else None
+        if when is None or (recur_until is not None and when > recur_until):
+            return await ctx.reply("That would never remind you of anything...", ephemeral=True)
+        if len(upcoming) < 2 or any(b - a < RECURRENCE_MIN_GAP for a, b in zip(upcoming, upcoming[1:])):
+            return await ctx.reply(invalid, ephemeral=True)
+        if when > now + relativedelta(years=5, seconds=1):
+            return await ctx.reply("that's too far into the future... please try less than 5 years!", ephemeral=True)
+
+        await self.create_reminder(ctx, when, what, recurrence, recur_until, flags.count)
+
+        ends = ''
+        if flags.count:
+            ends = f", {flags.count} time{plur(flags.count)}"
+        if recur_until is not None:
+            ends += f", until <t:{round(recur_until.timestamp())}:f>"
+        await ctx.reply(f"Okay dokey, {describe_recurrence(recurrence)} from <t:{round(when.timestamp())}:R>{ends}: {what}", ephemeral=False)
 
     @commands.hybrid_command(name="reminders", description="View your reminders")
     async def reminders(self, ctx: Context):
-        
-        async with self.bot.get_cursor() as cursor:
-            await cursor.execute('''
-                    SELECT id, time_created, time_expire, content
-                    FROM reminders
-                    WHERE user_id = %s
-                    ORDER BY time_created
-                ''', (ctx.author.id,))
-            reminders = await cursor.fetchall()
-
-        if not reminders:
-            return await ctx.reply("You have no reminders set... breh", ephemeral=True)
 
-        embed = discord.Embed(colour=discord.Colour.random())
-        embed.set_author(name=ctx.author.name + "'s reminders", icon_url=ctx.author.display_avatar.url)
-        for i, reminder in enumerate(reminders, start=1):
-            #id = reminder[0]
-            ts_created = round(reminder[1].replace(tzinfo=timezone.utc).timestamp())
-            ts_expire = round(reminder[2].replace(tzinfo=timezone.utc).timestamp())
-            content = trim_str(reminder[3], 900)
+        view = RemindersListView(author=ctx.author, bot=self.bot, scheduler=self.scheduler)
+        await view.fetch_page()
 
-            embed.add_field(name=f"Reminder #{i}",
-                            value=f"Created: <t:{ts_created}:F>\nExpires: <t:{ts_expire}:f> (<t:{ts_expire}:R>)\nContent: {content}",
-                            inline=False)
+        if not view.reminders:
+            return await ctx.reply("You have no reminders set... breh", ephemeral=True)
 
-        view = RemindersListView(author_id=ctx.author.id, bot=self.bot, asyncio_timers=self.asyncio_timers,
-                                 reminders=reminders)
-        message = await ctx.reply(embed=embed, view=view)
+        message = await ctx.reply(embed=view.build_embed(), view=view)
         view.message = message
 
 
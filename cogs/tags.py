@@ -1,118 +1,226 @@
-from datetime import timezone
+from datetime import datetime, timezone
+from collections import Counter
+from typing import Literal
+import tempfile
 import logging
+import json
+import time
+import csv
+import io
 
+import asyncmy
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 
+from .utils import checks
 from .utils.views import YesOrNo
 from .utils.context import Context
+from .utils.tag_index import TagNameIndex
+from .utils.lru import LRUCache
+from .utils.common import plur, hybrid_msg_edit
+from .utils.pagination import PaginationEmbedsView
 from bot import Woolinator
 
 
 log = logging.getLogger(__name__)
 
+MAX_TAGS_PER_USER = 25  # per guild
+
+# Fields of an exported tag file, in order
+TAG_FILE_FIELDS = ("name", "content", "owner_id", "created", "uses")
+IMPORT_MAX_BYTES = 2 * 1024 * 1024
+IMPORT_BATCH_SIZE = 100
+
+
+class Tag:
+    """ One row of the `tags` table. """
+
+    __slots__ = ('id', 'user_id', 'guild_id', 'created', 'name', 'content', 'uses')
+
+    # The columns `from_row` expects, in order
+    COLUMNS = "id, user_id, guild_id, created, name, content, uses"
+
+    def __init__(self, id: int|None, user_id: int, guild_id: int, created: datetime, name: str, content: str, uses: int = 0):
+        self.id = id
+        self.user_id = user_id
+        self.guild_id = guild_id
+        self.created = created
+        self.name = name
+        self.content = content
+        self.uses = uses
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "Tag":
+        id, user_id, guild_id, created, name, content, uses = row
+        return cls(id, user_id, guild_id, created.replace(tzinfo=timezone.utc), name, content, uses)
+
 
 class Tags(commands.Cog, name="Tags", description="Create trigger-able messages"):
     
     def __init__(self, bot: Woolinator) -> None:
         self.bot: Woolinator = bot
-        self.db_columns_order = ["id", "user_id", "guild_id", "created", "name", "content"]
+        self.names = TagNameIndex(bot)
+        # (guild_id, lowercase name) -> tag; sized by content bytes
+        self.cache = LRUCache(max_entries=512, max_size=1024 * 1024)
+        self.pending_uses: Counter[int] = Counter()  # tag id -> uses not yet written to the database
+
+    async def cog_load(self):
+        if not self.flush_uses.is_running():
+            self.flush_uses.start()
+
+    async def cog_unload(self):
+        self.flush_uses.cancel()
+        await self.write_uses()
 
     async def cog_check(self, ctx: Context) -> bool:
         if ctx.guild is None: raise commands.NoPrivateMessage()
         return True
 
+    async def cog_before_invoke(self, ctx: Context) -> None:
+        # Tags made before a subcommand existed can share its name, which `?tag <name>` now runs instead
+        if ctx.interaction is not None or ctx.command.parent is None:
+            return
+        names = await self.names.get(ctx.guild.id)
+        if ctx.invoked_with in names:
+            await ctx.send(f"-# There's also a tag called '{self.prev_tag(ctx.invoked_with)}'; use `{ctx.clean_prefix}tag get {ctx.invoked_with}` to show it.")
+
     @property
     def emoji(self) -> discord.PartialEmoji:
         return discord.PartialEmoji(name="\U0001f3f7")
 
-    # --- Helpers ---
+    # --- Tasks ---
 
-    def prev_tag(self, tag: str) -> str:
-        return tag.replace('*', '\\*').replace('`', '\\`').replace('_', '\\_')
+    @tasks.loop(seconds=30)
+    async def flush_uses(self):
+        """ A task to write the buffered tag use counts, so `tag get` doesn't need a write per use. """
+        try:
+            await self.write_uses()
+        except Exception:
+            log.exception("Failed to write tag uses")
 
-    def index_tag(self, tag: list[str]) -> dict[str, str] | None:
-        if tag is None:
-            return None
-        
-        if len(tag) != len(self.db_columns_order):
-            log.warning(f"Tags length ({len(tag)}) does not match table columns length ({len(self.db_columns_order)})")
+    # --- Helpers ---
 
-        return {
-            self.db_columns_order[i]: tag[i] if self.db_columns_order[i] != 'created' else tag[i].replace(tzinfo=timezone.utc)
-            for i in range(len(self.db_columns_order))
-        }
+    async def write_uses(self) -> None:
+        if not self.pending_uses:
+            return
+        uses, self.pending_uses = self.pending_uses, Counter()
 
-    def index_tags(self, tags) -> list[dict[str, str]]:
-        return [self.index_tag(tag) for tag in tags]
+        # One statement for every tag, adding each tag's own count
+        cases = ' '.join(["WHEN %s THEN %s"] * len(uses))
+        placeholders = ', '.join(['%s'] * len(uses))
+        params = [value for item in uses.items() for value in item] + list(uses)
+        try:
+            async with self.bot.get_cursor() as cursor:
+                await cursor.execute(f"UPDATE tags SET uses = uses + CASE id {cases} END WHERE id IN ({placeholders})", params)
+        except Exception:
+            self.pending_uses.update(uses)  # keep them for the next flush
+            raise
+
+    def prev_tag(self, tag: str) -> str:
+        return tag.replace('*', '\\*').replace('`', '\\`').replace('_', '\\_')
 
     async def delete_tag(self, id: int):
         async with self.bot.get_cursor() as cursor:
             res = await cursor.execute("DELETE FROM tags WHERE id = %s", (id,))
         return res
 
-    async def get_all_tags_starts_with(self, starts_with: str, user: discord.Member|discord.User|None = None, guild: discord.Guild|None = None, limit: int|None = None) -> list[dict[str, str]]:
+    async def count_user_tags(self, user: discord.Member|discord.User, guild: discord.Guild) -> int:
         async with self.bot.get_cursor() as cursor:
+            await cursor.execute("SELECT COUNT(*) FROM tags WHERE user_id = %s AND guild_id = %s", (user.id, guild.id))
+            return (await cursor.fetchone())[0]
 
-            query = "SELECT * FROM tags WHERE LOWER(name) LIKE %s"
-            params = (f"{starts_with.lower()}%",)
-
-            if user is not None:
-                query += " AND user_id = %s"
-                params += (user.id,)
-
-            if guild is not None:
-                query += " AND guild_id = %s"
-                params += (guild.id,)
-
-            if limit is not None:
-                query += " LIMIT %s"
-                params += (limit,)
-
-            await cursor.execute(query, params)
-            tags = await cursor.fetchall()
-        return self.index_tags(tags)
-
-    async def get_user_tags(self, user: discord.Member|discord.User, guild: discord.Guild|None, limit: int|None = None) -> list[dict[str, str]]:
-        async with self.bot.get_cursor() as cursor:
-
-            if guild is None:
-                query = "SELECT * FROM tags WHERE user_id = %s"
-                params = (user.id,)
-            else:
-                query = "SELECT * FROM tags WHERE user_id = %s AND guild_id = %s"
-                params = (user.id, guild.id)
-                
-            if limit is not None:
-                query += " LIMIT %s"
-                params += (limit,)
-                
-            await cursor.execute(query, params)
-            tags = await cursor.fetchall()
-
-        return self.index_tags(tags)
-
-    async def get_guild_tags(self, guild: discord.Guild) -> list[dict[str, str]]:
-
-        async with self.bot.get_cursor() as cursor:
-            await cursor.execute("SELECT * FROM tags WHERE guild_id = %s", (guild.id))
-            tags = await cursor.fetchall()
+    async def get_tag(self, name: str, guild: discord.Guild) -> Tag | None:
+        tag = self.cache.get((guild.id, name.lower()))
+        if tag is not None:
+            return tag
 
-        return self.index_tags(tags)
-    
-    async def get_tag(self, name: str, guild: discord.Guild) -> dict[str, str]:
+        generation = self.cache.generation
         async with self.bot.get_cursor() as cursor:
-            await cursor.execute("SELECT * FROM tags WHERE LOWER(name) = LOWER(%s) AND guild_id = %s", (name, guild.id))
-            tag = await cursor.fetchone()
-        return self.index_tag(tag)
+            await cursor.execute(f"SELECT {Tag.COLUMNS} FROM tags WHERE guild_id = %s AND name_lower = %s", (guild.id, name.lower()))
+            row = await cursor.fetchone()
+        tag = Tag.from_row(row) if row is not None else None
+
+        # Keyed by the tag's own name, as the collation may also match differently accented names.
+        # Not stored if a tag changed meanwhile, as this row may be from before the change
+        if tag is not None and generation == self.cache.generation:
+            self.cache.put((guild.id, tag.name.lower()), tag, len(tag.content.encode()))
+        return tag
     
-    async def insert_tag(self, tag: dict[str, str]) -> None:
+    async def insert_tag(self, tag: Tag) -> None:
         async with self.bot.get_cursor() as cursor:
             await cursor.execute('''
-                    INSERT INTO tags (user_id, guild_id, created, name, content)
-                    VALUES (%s, %s, %s, %s, %s)
-                ''', (tag['user_id'], tag['guild_id'], tag['created'], tag['name'], tag['content']))
+                    INSERT INTO tags (user_id, guild_id, created, name, name_lower, content)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                ''', (tag.user_id, tag.guild_id, tag.created, tag.name, tag.name.lower(), tag.content))
+
+    def read_tag_file(self, data: bytes, filename: str) -> list[dict]:
+        """ The entries of a JSON or CSV tag file, as written by `tag export`; raises `ValueError` if it can't be read. """
+        text = data.decode('utf-8-sig')
+
+        if filename.lower().endswith('.csv'):
+            reader = csv.DictReader(io.StringIO(text))
+            if reader.fieldnames is None or not {'name', 'content'} <= set(reader.fieldnames):
+                raise ValueError("the CSV file needs a header row with `name` and `content` columns")
+            return list(reader)
+
+        entries = json.loads(text)
+        if not isinstance(entries, list) or not all(isinstance(entry, dict) for entry in entries):
+            raise ValueError("the JSON file should be a list of objects with `name` and `content` keys")
+        return entries
+
+    async def validate_import(self, ctx: Context, entries: list[dict]) -> tuple[list[tuple], list[str]]:
+        """ Check imported entries like `tag create` would; returns the rows to insert and why any others were skipped.
+
+        Tags keep the owner from the file if they're still in the server, otherwise they go to the importer.
+        Nobody is taken past the per-user tag limit, counting the tags they already own.
+        """
+        rows, problems, seen = [], [], set()
+        created = discord.utils.utcnow()
+        names = await self.names.get(ctx.guild.id)
+
+        async with self.bot.get_cursor() as cursor:
+            await cursor.execute("SELECT user_id, COUNT(*) FROM tags WHERE guild_id = %s GROUP BY user_id", (ctx.guild.id,))
+            owned = Counter(dict(await cursor.fetchall()))
+
+        for i, entry in enumerate(entries, start=1):
+            name, content = entry.get('name'), entry.get('content')
+            if not isinstance(name, str) or not isinstance(content, str) or not name.strip() or not content.strip():
+                problems.append(f"#{i}: Missing a name or content.")
+                continue
+
+            name = ''.join(name.splitlines())
+            name = await commands.clean_content(fix_channel_mentions=True, use_nicknames=False).convert(ctx, name)
+            content = await commands.clean_content(use_nicknames=False).convert(ctx, content)
+
+            valid, reason = self.is_valid_tag(name)
+            if not valid:
+                problems.append(f"#{i} '{self.prev_tag(name[:32])}': {reason}")
+                continue
+            if len(content) > 1900:
+                problems.append(f"#{i} '{self.prev_tag(name)}': Tag content cannot be longer than 1900 characters.")
+                continue
+            if name.lower() in seen:
+                problems.append(f"#{i} '{self.prev_tag(name)}': Appears more than once in the file.")
+                continue
+            seen.add(name.lower())
+            if name in names:
+                problems.append(f"#{i} '{self.prev_tag(name)}': Already exists in this server.")
+                continue
+
+            owner_id = entry.get('owner_id')
+            owner = ctx.guild.get_member(int(owner_id)) if str(owner_id).isdigit() else None
+            if owner is None or owner.bot:
+                owner = ctx.author
+
+            if owned[owner.id] >= MAX_TAGS_PER_USER:
+                problems.append(f"#{i} '{self.prev_tag(name)}': `@{owner.name}` would own more than {MAX_TAGS_PER_USER} tags.")
+                continue
+            owned[owner.id] += 1
+
+            rows.append((owner.id, ctx.guild.id, created, name, name.lower(), content))
+
+        return rows, problems
 
     def is_valid_tag(self, name: str) -> tuple[bool, str]:
         if len(name) > 32:
@@ -120,7 +228,7 @@ class Tags(commands.Cog, name="Tags", description="Create trigger-able messages"
 
         first_word, _, _ = name.partition(' ')
         root: commands.GroupMixin = self.bot.get_command("tag")
-        if first_word in root.all_commands:
+        if first_word.lower() in root.all_commands:
             return (False, "This tag name can't be used.")
 
         return (True, '')
@@ -129,22 +237,12 @@ class Tags(commands.Cog, name="Tags", description="Create trigger-able messages"
     # --- Autocomplete ---
 
     async def owned_tag_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
-        tags = await self.get_all_tags_starts_with(current, user=interaction.user, guild=interaction.guild, limit=15)
-
-        if len(tags) == 0:
-            return []
-        
-        options = [app_commands.Choice(name=tag['name'], value=tag['name']) for tag in tags]
-        return options
+        names = await self.names.get(interaction.guild.id)
+        return [app_commands.Choice(name=name, value=name) for name in names.starts_with(current, owner_id=interaction.user.id, limit=15)]
 
     async def guild_tag_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
-        tags = await self.get_all_tags_starts_with(current, guild=interaction.guild, limit=15)
-
-        if len(tags) == 0:
-            return []
-        
-        options = [app_commands.Choice(name=tag['name'], value=tag['name']) for tag in tags]
-        return options
+        names = await self.names.get(interaction.guild.id)
+        return [app_commands.Choice(name=name, value=name) for name in names.starts_with(current, limit=15)]
 
     # --- Commands ---
 
@@ -157,11 +255,17 @@ class Tags(commands.Cog, name="Tags", description="Create trigger-able messages"
 
         tag = await self.get_tag(name, ctx.guild)
 
+        # `?tag get <name>` reaches tags whose name is also a subcommand
+        if tag is None and ctx.interaction is None and name.lower().startswith("get "):
+            name = name[4:].lstrip()
+            tag = await self.get_tag(name, ctx.guild)
+
         if tag is None:
-            if ctx.interaction is None:
-                if name.startswith("get"):
-                    await ctx.reply("Tag does not exist! (BTW, you do not need to use the `get` argument when not using a slash command)", ephemeral=True)
-                    return
+            names = await self.names.get(ctx.guild.id)
+            suggestions = names.search(name, limit=3, threshold=0.4)
+            if suggestions:
+                await ctx.reply(f"Could not find a tag with that name! Did you mean: {', '.join(f"'{self.prev_tag(s)}'" for s in suggestions)}?", ephemeral=True)
+                return
             await ctx.reply("Could not find a tag with that name!", ephemeral=True)
             return
         
@@ -172,9 +276,64 @@ class Tags(commands.Cog, name="Tags", description="Create trigger-able messages"
             await ctx.message.delete()
 
         try:
-            await ctx.send(f"{tag['content']}\n{footer}", reference=ref)
+            await ctx.send(f"{tag.content}\n{footer}", reference=ref)
         except (discord.HTTPException):
             pass  # if the user deletes the referenced message before this message is sent
+        else:
+            self.pending_uses[tag.id] += 1
+
+    @tag.command(description="Show the most used tags")
+    @app_commands.describe(user="Only show tags owned by this user")
+    async def stats(self, ctx: Context, user: discord.Member|discord.User|None = None):
+        await self.write_uses()
+
+        async with self.bot.get_cursor() as cursor:
+            if user is None:
+                await cursor.execute('''
+                        SELECT name, uses
+                        FROM tags
+                        WHERE guild_id = %s
+                        ORDER BY uses DESC
+                        LIMIT 10
+                    ''', (ctx.guild.id,))
+                top_tags = await cursor.fetchall()
+
+                await cursor.execute('''
+                        SELECT user_id, SUM(uses) AS total
+                        FROM tags
+                        WHERE guild_id = %s
+                        GROUP BY user_id
+                        ORDER BY total DESC
+                        LIMIT 5
+                    ''', (ctx.guild.id,))
+                top_owners = await cursor.fetchall()
+            else:
+                await cursor.execute('''
+                        SELECT name, uses
+                        FROM tags
+                        WHERE user_id = %s AND guild_id = %s
+                        ORDER BY uses DESC
+                        LIMIT 10
+                    ''', (user.id, ctx.guild.id))
+                top_tags = await cursor.fetchall()
+                top_owners = []
+
+        if not top_tags:
+            await ctx.reply("There are no tags to show stats for!" if user is None else f"`@{user.name}` doesn't own any tags!", ephemeral=True)
+            return
+
+        embed = discord.Embed(colour=discord.Colour.random())
+        if user is None:
+            embed.set_author(name=f"Tag stats for {ctx.guild.name}", icon_url=getattr(ctx.guild.icon, "url", None))
+        else:
+            embed.set_author(name=f"{user.name}'s tag stats", icon_url=user.display_avatar.url)
+
+        embed.add_field(name="Top tags", value='\n'.join(f"{i}. {self.prev_tag(name)} - {uses} use{plur(uses)}"
+                                                         for i, (name, uses) in enumerate(top_tags, start=1)), inline=False)
+        if top_owners:
+            embed.add_field(name="Top tag owners", value='\n'.join(f"{i}. <@{user_id}> - {int(total)} use{plur(int(total))}"
+                                                                   for i, (user_id, total) in enumerate(top_owners, start=1)), inline=False)
+        await ctx.reply(embed=embed)
 
     @tag.command(description="Create a tag w/ a modal")
     async def modal(self, ctx: Context):
@@ -185,14 +344,14 @@ class Tags(commands.Cog, name="Tags", description="Create trigger-able messages"
 
     @tag.command(description="Delete all your tags")
     async def clear(self, ctx: Context):
-        tags = await self.get_user_tags(ctx.author, ctx.guild)
+        count = await self.count_user_tags(ctx.author, ctx.guild)
 
-        if len(tags) == 0:
+        if count == 0:
             await ctx.reply("You do not own any tags!", ephemeral=True)
             return
         
         view = YesOrNo(ctx.author)
-        message = await ctx.reply(f"Are you sure you want to delete ALL your {len(tags)} tags? They'll be gone forever!", view=view)
+        message = await ctx.reply(f"Are you sure you want to delete ALL your {count} tags? They'll be gone forever!", view=view)
         view.message = message
         await view.wait()
 
@@ -201,8 +360,12 @@ class Tags(commands.Cog, name="Tags", description="Create trigger-able messages"
 
         async with self.bot.get_cursor() as cursor:
             await cursor.execute("DELETE FROM tags WHERE user_id = %s AND guild_id = %s", (ctx.author.id, ctx.guild.id))
-        
-        await message.edit(content=f"Successfully deleted the {len(tags)} tags.", embed=None, view=None)
+
+        if (names := self.names.peek(ctx.guild.id)) is not None:
+            names.remove_owner(ctx.author.id)
+        self.cache.pop_where(lambda key, tag: key[0] == ctx.guild.id and tag.user_id == ctx.author.id)
+
+        await message.edit(content=f"Successfully deleted the {count} tags.", embed=None, view=None)
 
     @tag.command(description="Create a tag")
     @app_commands.describe(name="The name of the tag", content="The message in the tag")
@@ -216,25 +379,25 @@ class Tags(commands.Cog, name="Tags", description="Create trigger-able messages"
             await ctx.reply(reason, ephemeral=True)
             return
         
-        tags = await self.get_user_tags(ctx.author, ctx.guild)
-
-        if len(tags) >= 25:
-            await ctx.reply("You can only own 25 tags at a time (per guild)!", ephemeral=True)
+        if await self.count_user_tags(ctx.author, ctx.guild) >= MAX_TAGS_PER_USER:
+            await ctx.reply(f"You can only own {MAX_TAGS_PER_USER} tags at a time (per guild)!", ephemeral=True)
             return
 
         tag = await self.get_tag(name, ctx.guild)
 
         if tag is not None:
 
-            if tag['user_id'] == ctx.author.id:
-                await ctx.reply(f"You already own the tag '{self.prev_tag(tag['name'])}'! To modify it, use '/tag edit {self.prev_tag(tag['name'])}'", ephemeral=True)
+            if tag.user_id == ctx.author.id:
+                await ctx.reply(f"You already own the tag '{self.prev_tag(tag.name)}'! To modify it, use '/tag edit {self.prev_tag(tag.name)}'", ephemeral=True)
                 return
             else:
-                tag_owner = await self.bot.get_or_fetch_user(tag['user_id'])
-                await ctx.reply(f"Tag with name '{self.prev_tag(tag['name'])}' already exists, and is owned by `@{tag_owner.name}`! Try another name.", ephemeral=True)
+                tag_owner = await self.bot.get_or_fetch_user(tag.user_id)
+                await ctx.reply(f"Tag with name '{self.prev_tag(tag.name)}' already exists, and is owned by `@{tag_owner.name}`! Try another name.", ephemeral=True)
                 return
 
-        await self.insert_tag({"user_id": ctx.author.id, "guild_id": ctx.guild.id, "created": discord.utils.utcnow(), "name": name, "content": content})
+        await self.insert_tag(Tag(None, ctx.author.id, ctx.guild.id, discord.utils.utcnow(), name, content))
+        if (names := self.names.peek(ctx.guild.id)) is not None:
+            names.add(name, ctx.author.id)
 
         await ctx.reply(f"You are now the proud owner of the tag '{self.prev_tag(name)}'!")
 
@@ -250,11 +413,11 @@ class Tags(commands.Cog, name="Tags", description="Create trigger-able messages"
             await ctx.reply("Tag does not exist!", ephemeral=True)
             return
         
-        created_ts = round(tag['created'].timestamp())
+        created_ts = round(tag.created.timestamp())
 
         view = YesOrNo(ctx.author)
         embed = discord.Embed(description=f"> Created on <t:{created_ts}:d> at <t:{created_ts}:T>", colour=discord.Colour.red())
-        embed.set_author(name=tag['name'], icon_url=ctx.author.display_avatar.url)
+        embed.set_author(name=tag.name, icon_url=ctx.author.display_avatar.url)
         message = await ctx.reply("Are you sure you want to delete this tag?", embed=embed, view=view)
         view.message = message
         await view.wait()
@@ -262,21 +425,37 @@ class Tags(commands.Cog, name="Tags", description="Create trigger-able messages"
         if not view.value:
             return
 
-        await self.delete_tag(tag['id'])
-        await message.edit(content=f"Successfully deleted the tag '{self.prev_tag(tag['name'])}'.", embed=None, view=None)
+        await self.delete_tag(tag.id)
+        if (names := self.names.peek(ctx.guild.id)) is not None:
+            names.remove(tag.name)
+        self.cache.pop((ctx.guild.id, tag.name.lower()))
+        await message.edit(content=f"Successfully deleted the tag '{self.prev_tag(tag.name)}'.", embed=None, view=None)
 
     @tag.command(description="List tags owned by a specific user")
     @app_commands.describe(user="The user to list tags for")
     async def list(self, ctx: Context, user: discord.Member|discord.User = commands.Author):
-        tags = await self.get_user_tags(user, ctx.guild)
+        # Members own at most `MAX_TAGS_PER_USER` tags, so their names are read in one go
+        async with self.bot.get_cursor() as cursor:
+            await cursor.execute("SELECT name FROM tags WHERE user_id = %s AND guild_id = %s ORDER BY name_lower", (user.id, ctx.guild.id))
+            names = [row[0] for row in await cursor.fetchall()]
 
-        if len(tags) == 0:
-            await ctx.reply("You don't own any tags!", ephemeral=True)
+        if len(names) == 0:
+            await ctx.reply("You don't own any tags!" if user == ctx.author else f"`@{user.name}` doesn't own any tags!", ephemeral=True)
             return
 
-        embed = discord.Embed(description='\n'.join(f'{i}. {self.prev_tag(tag['name'])}' for i, tag in enumerate(tags, start=1)), colour=discord.Colour.random())
-        embed.set_author(name=f"{user.name}'s tags", icon_url=user.display_avatar.url)
-        await ctx.reply(embed=embed)
+        embeds = []
+        for start in range(0, len(names), 20):
+            embed = discord.Embed(description='\n'.join(f"{i}. {self.prev_tag(name)}" for i, name in enumerate(names[start:start + 20], start=start + 1)),
+                                  colour=discord.Colour.random())
+            embed.set_author(name=f"{user.name}'s tags", icon_url=user.display_avatar.url)
+            embed.set_footer(text=f"{len(names)} tag{plur(len(names))}")
+            embeds.append(embed)
+
+        if len(embeds) == 1:
+            await ctx.reply(embed=embeds[0])
+        else:
+            view = PaginationEmbedsView(embeds, author_id=ctx.author.id)
+            view.message = await ctx.reply(embed=embeds[0], view=view)
 
     @tag.command(description="Rename a tag")
     @app_commands.describe(name="The name of the tag", new_name="The new name of the tag")
@@ -299,7 +478,7 @@ class Tags(commands.Cog, name="Tags", description="Create trigger-able messages"
             await ctx.reply("That tag does not exist!", ephemeral=True)
             return
 
-        if (old_tag['user_id'] != ctx.author.id) and (not ctx.author.guild_permissions.manage_guild):
+        if (old_tag.user_id != ctx.author.id) and (not ctx.author.guild_permissions.manage_guild):
             await ctx.reply("You do not own this tag or have permission to rename it!", ephemeral=True)
             return
         
@@ -310,9 +489,12 @@ class Tags(commands.Cog, name="Tags", description="Create trigger-able messages"
             return
         
         async with self.bot.get_cursor() as cursor:
-            await cursor.execute("UPDATE tags SET name = %s WHERE LOWER(name) = LOWER(%s) AND guild_id = %s", (new_name, name, ctx.guild.id))
+            await cursor.execute("UPDATE tags SET name = %s, name_lower = %s WHERE id = %s", (new_name, new_name.lower(), old_tag.id))
+        if (names := self.names.peek(ctx.guild.id)) is not None:
+            names.rename(old_tag.name, new_name)
+        self.cache.pop((ctx.guild.id, old_tag.name.lower()))
 
-        await ctx.reply(f"Successfully renamed tag '{self.prev_tag(old_tag['name'])}' to '{self.prev_tag(new_name)}'!")
+        await ctx.reply(f"Successfully renamed tag '{self.prev_tag(old_tag.name)}' to '{self.prev_tag(new_name)}'!")
 
     @tag.command(description="Get information about a specific tag")
     @app_commands.describe(name="The name of the tag")
@@ -327,40 +509,30 @@ class Tags(commands.Cog, name="Tags", description="Create trigger-able messages"
             await ctx.reply("A tag with that name does not exist!", ephemeral=True)
             return
         
-        tag_owner = await self.bot.get_or_fetch_user(tag['user_id'])
-        tag_created_ts = round(tag['created'].timestamp())
+        tag_owner = await self.bot.get_or_fetch_user(tag.user_id)
+        tag_created_ts = round(tag.created.timestamp())
 
-        embed = discord.Embed(title=f"Name: {tag['name']}", description=f"**Created:** at <t:{tag_created_ts}:T> on <t:{tag_created_ts}:d>", colour=discord.Colour.random())
+        embed = discord.Embed(title=f"Name: {tag.name}", description=f"**Created:** at <t:{tag_created_ts}:T> on <t:{tag_created_ts}:d>", colour=discord.Colour.random())
         embed.set_author(name=f"Owned by @{tag_owner}", icon_url=tag_owner.display_avatar.url)
         await ctx.reply(embed=embed)
 
-    @tag.command(description="Search for tags by name")
+    @tag.command(description="Search for tags by name, including close matches")
     @app_commands.describe(query="The text to search tag names for")
     async def search(self, ctx: Context, *, query: commands.Range[str, 2, 32]):
         query = ''.join(query.splitlines())
         query = await commands.clean_content(fix_channel_mentions=True, use_nicknames=False).convert(ctx, query)
 
-        # Escape LIKE wildcards so the query is treated as literal text
-        escaped = query.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
-
-        async with self.bot.get_cursor() as cursor:
-            await cursor.execute('''
-                    SELECT name
-                    FROM tags
-                    WHERE guild_id = %s AND LOWER(name) LIKE %s
-                    ORDER BY name ASC
-                    LIMIT 20
-                ''', (ctx.guild.id, f"%{escaped}%"))
-            tags = await cursor.fetchall()
+        guild_names = await self.names.get(ctx.guild.id)
+        tags = guild_names.search(query, limit=20)
 
         if len(tags) == 0:
             await ctx.reply(f"No tags found matching '{self.prev_tag(query)}'.", ephemeral=True)
             return
 
-        names = '\n'.join(f"{i}. {self.prev_tag(tag[0])}" for i, tag in enumerate(tags, start=1))
+        names = '\n'.join(f"{i}. {self.prev_tag(tag)}" for i, tag in enumerate(tags, start=1))
         embed = discord.Embed(description=names, colour=discord.Colour.random())
         embed.set_author(name=f"Tags matching '{query}'", icon_url=getattr(ctx.guild.icon, "url", None))
-        embed.set_footer(text=f"{len(tags)} result{'' if len(tags) == 1 else 's'}{' (showing first 20)' if len(tags) == 20 else ''}")
+        embed.set_footer(text=f"{len(tags)} result{'' if len(tags) == 1 else 's'}{' (showing best 20)' if len(tags) == 20 else ''}")
         await ctx.reply(embed=embed)
 
     @tag.command(description="Modify the content of a tag", aliases=["edit"])
@@ -377,7 +549,7 @@ class Tags(commands.Cog, name="Tags", description="Create trigger-able messages"
             await ctx.reply("A tag with that name does not exist!", ephemeral=True)
             return
 
-        if tag['user_id'] != ctx.author.id:
+        if tag.user_id != ctx.author.id:
             await ctx.reply("You do not own this tag!", ephemeral=True)
             return
 
@@ -385,8 +557,9 @@ class Tags(commands.Cog, name="Tags", description="Create trigger-able messages"
             await cursor.execute('''
                     UPDATE tags
                     SET content = %s
-                    WHERE user_id = %s AND LOWER(name) = LOWER(%s) AND guild_id = %s
-                ''', (new_content, ctx.author.id, name, ctx.guild.id))
+                    WHERE id = %s AND user_id = %s
+                ''', (new_content, tag.id, ctx.author.id))
+        self.cache.pop((ctx.guild.id, tag.name.lower()))
 
         await ctx.reply("Successfully updated tag content.")
 
@@ -403,10 +576,10 @@ class Tags(commands.Cog, name="Tags", description="Create trigger-able messages"
             await ctx.reply("No tag by that name exists - you can create it yourself!", ephemeral=True)
             return
         
-        member = ctx.guild.get_member(tag['user_id'])
+        member = ctx.guild.get_member(tag.user_id)
         if member is None:
             try:
-                member = await ctx.guild.fetch_member(tag['user_id'])
+                member = await ctx.guild.fetch_member(tag.user_id)
             except discord.NotFound:
                 member = None  # owner has left the server, tag is claimable
             except discord.HTTPException:
@@ -421,10 +594,13 @@ class Tags(commands.Cog, name="Tags", description="Create trigger-able messages"
             await cursor.execute('''
                     UPDATE tags
                     SET user_id = %s
-                    WHERE LOWER(name) = LOWER(%s) AND guild_id = %s
-                ''', (ctx.author.id, name, ctx.guild.id))
+                    WHERE id = %s
+                ''', (ctx.author.id, tag.id))
+        if (names := self.names.peek(ctx.guild.id)) is not None:
+            names.set_owner(tag.name, ctx.author.id)
+        self.cache.pop((ctx.guild.id, tag.name.lower()))
 
-        await ctx.reply(f"You are now the proud owner of the tag '{self.prev_tag(tag['name'])}'!")
+        await ctx.reply(f"You are now the proud owner of the tag '{self.prev_tag(tag.name)}'!")
 
     @tag.command(description="Transfer ownership of a tag")
     @app_commands.describe(name="The name of the tag", new_owner="The new owner of the tag")
@@ -438,10 +614,8 @@ class Tags(commands.Cog, name="Tags", description="Create trigger-able messages"
             await ctx.reply("You cannot transfer a tag to a bot!", ephemeral=True)
             return
 
-        tags = await self.get_user_tags(new_owner, ctx.guild)
-
-        if len(tags) >= 25:
-            await ctx.reply("This person has reached the max of 25 tags!", ephemeral=True)
+        if await self.count_user_tags(new_owner, ctx.guild) >= MAX_TAGS_PER_USER:
+            await ctx.reply(f"This person has reached the max of {MAX_TAGS_PER_USER} tags!", ephemeral=True)
             return
 
         tag = await self.get_tag(name, ctx.guild)
@@ -450,25 +624,129 @@ class Tags(commands.Cog, name="Tags", description="Create trigger-able messages"
             await ctx.reply("A tag with that name does not exist!", ephemeral=True)
             return
 
-        if (tag['user_id'] != ctx.author.id) and (not ctx.author.guild_permissions.manage_guild):
+        if (tag.user_id != ctx.author.id) and (not ctx.author.guild_permissions.manage_guild):
             await ctx.reply("You do not own this tag or have permission to transfer it!", ephemeral=True)
             return
 
-        if new_owner.id == tag['user_id']:
+        if new_owner.id == tag.user_id:
             await ctx.reply("That user already owns this tag...", ephemeral=True)
             return
 
-        old_owner = await self.bot.get_or_fetch_user(tag['user_id'])
+        old_owner = await self.bot.get_or_fetch_user(tag.user_id)
 
         async with self.bot.get_cursor() as cursor:
             await cursor.execute('''
                     UPDATE tags
                     SET user_id = %s
-                    WHERE LOWER(name) = LOWER(%s) AND guild_id = %s
-                ''', (new_owner.id, name, ctx.guild.id))
+                    WHERE id = %s
+                ''', (new_owner.id, tag.id))
+        if (names := self.names.peek(ctx.guild.id)) is not None:
+            names.set_owner(tag.name, new_owner.id)
+        self.cache.pop((ctx.guild.id, tag.name.lower()))
 
         await ctx.reply(f"Tag ownership transferred from `@{old_owner.name}` to `@{new_owner.name}`")
 
+    @tag.command(description="Export all of the server's tags as a file")
+    @app_commands.describe(file_format="The format of the file")
+    @app_commands.rename(file_format="format")
+    @commands.cooldown(1, 30, commands.BucketType.guild)
+    async def export(self, ctx: Context, file_format: Literal["json", "csv"] = "json"):
+        await ctx.typing()
+
+        # Rows are streamed from the database into the file, which only moves to disk once it gets big
+        with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as fp:
+            out = io.TextIOWrapper(fp, encoding='utf-8', newline='')
+            writer = csv.writer(out) if file_format == "csv" else None
+            if writer is not None:
+                writer.writerow(TAG_FILE_FIELDS)
+            else:
+                out.write('[')
+
+            count = 0
+            async with self.bot.get_cursor(asyncmy.cursors.SSCursor) as cursor:
+                await cursor.execute("SELECT name, content, user_id, created, uses FROM tags WHERE guild_id = %s ORDER BY name_lower", (ctx.guild.id,))
+                while rows := await cursor.fetchmany(500):
+                    for name, content, user_id, created, uses in rows:
+                        values = (name, content, user_id, created.replace(tzinfo=timezone.utc).isoformat(), uses)
+                        if writer is not None:
+                            writer.writerow(values)
+                        else:
+                            out.write((',' if count else '') + '\n  ' + json.dumps(dict(zip(TAG_FILE_FIELDS, values)), ensure_ascii=False))
+                        count += 1
+
+            if writer is None:
+                out.write('\n]\n')
+            out.flush()
+            out.detach()
+
+            if count == 0:
+                await ctx.reply("This server doesn't have any tags!", ephemeral=True)
+                return
+
+            if fp.tell() > ctx.guild.filesize_limit:
+                await ctx.reply("The exported tags are too big to upload here!", ephemeral=True)
+                return
+
+            fp.seek(0)
+            await ctx.reply(f"Exported {count} tag{plur(count)}.", file=discord.File(fp, filename=f"tags-{ctx.guild.id}.{file_format}"))
+
+    @tag.command(name="import", description="Import tags from a JSON or CSV file, e.g. one made by /tag export")
+    @app_commands.describe(file="A JSON list of objects, or a CSV file with a header row; both need `name` and `content`")
+    @checks.hybrid_has_permissions(manage_guild=True)
+    @commands.cooldown(1, 30, commands.BucketType.guild)
+    async def import_tags(self, ctx: Context, file: discord.Attachment):
+        if file.size > IMPORT_MAX_BYTES:
+            await ctx.reply(f"That file is too big! The limit is {IMPORT_MAX_BYTES // (1024 * 1024)} MB.", ephemeral=True)
+            return
+
+        await ctx.typing()
+        try:
+            entries = self.read_tag_file(await file.read(), file.filename)
+        except (ValueError, csv.Error) as e:
+            await ctx.reply(f"Could not read that file: {e}", ephemeral=True)
+            return
+
+        rows, problems = await self.validate_import(ctx, entries)
+        if not rows:
+            await ctx.reply("There were no valid tags to import!\n" + '\n'.join(f"- {p}" for p in problems[:10]), ephemeral=True)
+            return
+
+        message = await ctx.reply(f"Importing {len(rows)} tag{plur(len(rows))}... 0/{len(rows)}")
+
+        # All or nothing, so a failure part way through doesn't leave half the file imported.
+        # Names created since validating are skipped by `INSERT IGNORE`
+        imported = 0
+        last_progress = time.monotonic()
+        async with self.bot.get_cursor() as cursor:
+            await cursor.connection.begin()
+            try:
+                for start in range(0, len(rows), IMPORT_BATCH_SIZE):
+                    batch = rows[start:start + IMPORT_BATCH_SIZE]
+                    imported += await cursor.executemany('''
+                            INSERT IGNORE INTO tags (user_id, guild_id, created, name, name_lower, content)
+                            VALUES (%s, %s, %s, %s, %s, %s)
+                        ''', batch) or 0
+
+                    if time.monotonic() - last_progress >= 2:
+                        last_progress = time.monotonic()
+                        await hybrid_msg_edit(message, f"Importing {len(rows)} tag{plur(len(rows))}... {start + len(batch)}/{len(rows)}")
+            except BaseException:
+                await cursor.connection.rollback()
+                raise
+            await cursor.connection.commit()
+
+        self.names.forget(ctx.guild.id)
+
+        lines = [f"Imported {imported} of {len(entries)} tag{plur(len(entries))}."]
+        if existing := len(rows) - imported:
+            lines.append(f"{existing} already existed in this server.")
+        if problems:
+            lines.append(f"{len(problems)} {'was' if len(problems) == 1 else 'were'} skipped:")
+            lines.extend(f"- {p}" for p in problems[:10])
+            if len(problems) > 10:
+                lines.append(f"...and {len(problems) - 10} more")
+        await hybrid_msg_edit(message, '\n'.join(lines))
+
 
 async def setup(bot: Woolinator) -> None:
     await bot.add_cog(Tags(bot))
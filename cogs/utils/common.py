@@ -1,7 +1,8 @@
 import re
-from datetime import timedelta
+from datetime import timedelta, datetime, date, time, timezone, tzinfo
 
 from dateutil.relativedelta import relativedelta
+from dateutil.rrule import rrulestr
 import discord
 
 async def hybrid_msg_edit(message: discord.Message|discord.InteractionMessage|discord.InteractionCallbackResponse|None, content: str|None, **kwargs):
@@ -24,6 +25,21 @@ def trim_str(string: str, max_length: int) -> str:
         return string[:max_length-3] + '...'
     return string
 
+def role_diff(before: discord.Member, after: discord.Member) -> tuple[list[discord.Role], list[discord.Role]]:
+    """ Roles added to and removed from a member between two states, compared by ID sets.
+
+    Returns:
+        tuple: The added roles and the removed roles, each in the member's role order.
+    """
+    before_ids = {r.id for r in before.roles}
+    after_ids = {r.id for r in after.roles}
+    if before_ids == after_ids:
+        return [], []
+
+    added = [r for r in after.roles if r.id not in before_ids]
+    removed = [r for r in before.roles if r.id not in after_ids]
+    return added, removed
+
 def plur(val: int) -> str:
     """ Returns 's' if the value is 2 or more or 0. """
     if val == 0 or val >= 2:
@@ -54,15 +70,106 @@ def format_timedelta(td: timedelta):
     else:
         return ', '.join(parts[:-1]) + ' and ' + parts[-1]
 
+# Every accepted spelling of a unit -> (relativedelta keyword, largest value allowed). Any prefix of a unit's
+# name is accepted, with earlier units taking precedence, so 'm' is minutes and 'mo' months
+_DURATION_UNITS: dict[str, tuple[str, int]] = {}
+for _name, _aliases, _limit in (
+    ("seconds", ("secs",), 4 * 12 * 30 * 24 * 60 * 60),
+    ("minutes", ("mins",), 4 * 12 * 30 * 24 * 60),
+    ("hours", ("hrs", "hr"), 4 * 12 * 30 * 24),
+    ("days", (), 4 * 12 * 30),
+    ("weeks", (), 4 * 12 * 4),
+    ("months", (), 4 * 12),
+    ("years", ("yrs", "yr"), 4),
+):
+    for _spelling in (*(_name[:i] for i in range(1, len(_name) + 1)), *_aliases):
+        _DURATION_UNITS.setdefault(_spelling, (_name, _limit))
+
+# One scanner for everything; the last group of each alternative names the kind of token
+_TIME_TOKEN_RE = re.compile(r"""
+      (?P<sep>(?:[\s,&+]|\band\b)+)
+    | (?P<y>\d{4})-(?P<mo>\d{1,2})-(?P<date>\d{1,2})\b
+    | (?P<h12>\d{1,2})(?::(?P<m12>\d{2}))?\s*(?P<meridiem>am|pm)\b
+    | (?P<h24>\d{1,2}):(?P<clock>\d{2})\b
+    | (?P<value>\d+)\s*(?P<unit>[a-z]+)
+    | (?P<word>today|tomorrow|in|at|on)\b
+    | (?P<bad>[^\s,&+]+)
+""", re.IGNORECASE | re.VERBOSE)
+
+
+def _scan_entered_time(when: str) -> tuple[relativedelta, list[str], list[str], date | None, time | None, int | None]:
+    """ Splits what was entered into its relative part, and any date, time of day or days ahead ('today', 'tomorrow'). """
+
+    duration = relativedelta()
+    invalid_formats = []
+    too_long = []
+    on_date: date | None = None
+    at_time: time | None = None
+    days_ahead: int | None = None
+    amounts: dict[str, int] = {}
+
+    for match in _TIME_TOKEN_RE.finditer(when):
+        kind = match.lastgroup
+        if kind == "sep":
+            continue
+
+        if kind == "unit":
+            unit = _DURATION_UNITS.get(match.group("unit").lower())
+            if unit is None:
+                invalid_formats.append(match.group())
+                continue
+            name, limit = unit
+            value = int(match.group("value"))
+            if value > limit:
+                too_long.append(match.group())
+                continue
+            amounts[name] = amounts.get(name, 0) + value
+
+        elif kind == "word":
+            word = match.group("word").lower()
+            if word in ("today", "tomorrow"):
+                days_ahead = (days_ahead or 0) + (word == "tomorrow")
+
+        elif kind == "date":
+            try:
+                parsed = date(int(match.group("y")), int(match.group("mo")), int(match.group("date")))
+            except ValueError:
+                parsed = None
+            if parsed is None or on_date is not None:
+                invalid_formats.append(match.group())
+            else:
+                on_date = parsed
+
+        elif kind in ("meridiem", "clock"):
+            if kind == "meridiem":
+                hour, minute = int(match.group("h12")), int(match.group("m12") or 0)
+                valid = 1 <= hour <= 12
+                hour = hour % 12 + (12 if match.group("meridiem").lower() == "pm" else 0)
+            else:
+                hour, minute = int(match.group("h24")), int(match.group("clock"))
+                valid = hour <= 23
+            if not valid or minute > 59 or at_time is not None:
+                invalid_formats.append(match.group())
+            else:
+                at_time = time(hour, minute)
+
+        else:
+            invalid_formats.append(match.group())
+
+    if amounts:
+        duration = relativedelta(**amounts)
+    return duration, invalid_formats, too_long, on_date, at_time, days_ahead
+
 def parse_entered_duration(when: str) -> tuple[relativedelta, list[str], list[str]]:
     """ Parses a human-readable duration string into a `relativedelta` object.
 
-    The input string can contain multiple time expressions (e.g., '2h, 30m, 1day'), 
-    separated by commas and spaces. Each time expression should include 
+    The input string can contain multiple time expressions (e.g., '2h, 30m, 1day'),
+    separated by commas, spaces, '&', '+' or 'and'. Each time expression should include
     a number followed by a time unit (e.g., '10 min', '2 hours', '1d', etc.).
 
-    Time values that exceed reasonable limits (more than 4 years) are flagged 
-    and not included in the final duration.
+    Time values that exceed reasonable limits (more than 4 years) are flagged
+    and not included in the final duration. Dates and times of day are not durations,
+    so are reported as invalid; see `parse_entered_time` for those.
 
     Returns:
         tuple:
@@ -75,70 +182,107 @@ def parse_entered_duration(when: str) -> tuple[relativedelta, list[str], list[st
         (relativedelta(days=+5, hours=+2, minutes=+30, seconds=+1), [], [])
     """
 
-    duration = relativedelta()
+    duration, invalid_formats, too_long, on_date, at_time, days_ahead = _scan_entered_time(when)
+    if on_date is not None or at_time is not None or days_ahead is not None:
+        invalid_formats.append(when.strip())
+    return duration, invalid_formats, too_long
 
-    invalid_formats = []
-    too_long = []
+def parse_entered_time(when: str, now: datetime, tz: tzinfo | None = None) -> tuple[datetime | None, list[str], list[str]]:
+    """ Parses when something should happen, either relative ('2h, 30m') or absolute ('tomorrow 9am',
+    '2026-12-25 18:00', 'in 3h at 17:00').
 
-    when: list[str] = when.replace('and', ',').replace('&', ',').replace('+', ',').split(',')
-    for d in when:
-        d = d.strip()
-        if not d:
-            continue
+    Dates and times of day are in `tz`, or UTC if not given. The relative part is added first, then
+    the time of day is set on the day that lands on. A time of day on its own that has already
+    passed today means tomorrow; anything else in the past is returned as is.
 
-        # The whole part must be a number followed by a unit, e.g. '10 min'
-        match = re.fullmatch(r"(\d+)\s*([A-Za-z]+)", d)
-
-        if match:
-            value = int(match.group(1))  # The number (value)
-            unit = match.group(2).lower()  # The unit (characters)
-
-            if "seconds".startswith(unit) or unit == "secs":
-                if value > 4 * 12 * 30 * 24 * 60 * 60:
-                    too_long.append(d)
-                    continue
-                duration += relativedelta(seconds=value)
-
-            elif "minutes".startswith(unit) or unit == "mins":
-                if value > 4 * 12 * 30 * 24 * 60:
-                    too_long.append(d)
-                    continue
-                duration += relativedelta(minutes=value)
-
-            elif "hours".startswith(unit) or unit == "hrs" or unit == "hr":
-                if value > 4 * 12 * 30 * 24:
-                    too_long.append(d)
-                    continue
-                duration += relativedelta(hours=value)
-
-            elif "days".startswith(unit):
-                if value > 4 * 12 * 30:
-                    too_long.append(d)
-                    continue
-                duration += relativedelta(days=value)
-
-            elif "weeks".startswith(unit):
-                if value > 4 * 12 * 4:
-                    too_long.append(d)
-                    continue
-                duration += relativedelta(weeks=value)
-
-            elif "months".startswith(unit):
-                if value > 4 * 12:
-                    too_long.append(d)
-                    continue
-                duration += relativedelta(months=value)
-
-            elif "years".startswith(unit) or unit == "yrs" or unit == "yr":
-                if value > 4:
-                    too_long.append(d)
-                    continue
-                duration += relativedelta(years=value)
+    Returns:
+        tuple:
+            datetime | None: The time in UTC, or None if nothing valid was entered.
+            list[str]: Substrings that could not be parsed due to invalid format.
+            list[str]: Substrings that were valid but rejected for being excessively long.
 
-            else:
-                invalid_formats.append(d)
+    Example:
+        >>> parse_entered_time('tomorrow 9am', datetime(2026, 1, 1, 12, tzinfo=timezone.utc))
+        (datetime.datetime(2026, 1, 2, 9, 0, tzinfo=datetime.timezone.utc), [], [])
+    """
+
+    duration, invalid_formats, too_long, on_date, at_time, days_ahead = _scan_entered_time(when)
+    if invalid_formats or too_long:
+        return None, invalid_formats, too_long
+
+    if on_date is None and at_time is None and days_ahead is None:
+        if not duration:
+            return None, [when.strip()], []
+        return now + duration, [], []
+
+    tz = tz or timezone.utc
+    local = now.astimezone(tz)
+    target = local if on_date is None else datetime.combine(on_date, time(), tzinfo=tz)
+    target += relativedelta(days=days_ahead or 0) + duration
+
+    if at_time is not None:
+        target = datetime.combine(target.date(), at_time, tzinfo=tz)
+        if target <= local and on_date is None and days_ahead is None and not duration:
+            target = datetime.combine(target.date() + timedelta(days=1), at_time, tzinfo=tz)
+
+    return target.astimezone(timezone.utc), [], []
+
+RECURRENCE_MIN_GAP = timedelta(minutes=5)
+_RECURRENCE_UNITS = (("WEEKLY", 7 * 24 * 60 * 60), ("DAILY", 24 * 60 * 60), ("HOURLY", 60 * 60), ("MINUTELY", 60))
+_RECURRENCE_NAMES = {"MONTHLY": "month", "WEEKLY": "week", "DAILY": "day", "HOURLY": "hour", "MINUTELY": "minute"}
 
+def parse_recurrence(every: str, start: datetime) -> str | None:
+    """ Turns how often something should repeat into an iCalendar RRULE, without DTSTART, COUNT or UNTIL.
+
+    Accepts either a duration in the same format as `parse_entered_duration` (e.g. '1d', '1w, 3d') or an
+    RRULE (e.g. 'FREQ=WEEKLY;BYDAY=MO,FR'). Rules are anchored on `start`. Only the rule itself is checked
+    here; how often it repeats is left to `expand_recurrence`, since working out occurrences can be slow.
+
+    Returns:
+        str | None: The rule, or None if it's invalid.
+
+    Example:
+        >>> parse_recurrence('2 weeks', discord.utils.utcnow())
+        'FREQ=WEEKLY;INTERVAL=2'
+    """
+
+    every = every.strip()
+    if "FREQ=" in every.upper():
+        rule = every.upper().removeprefix("RRULE:")
+        # The start, count and end are managed per reminder
+        if any(part in rule for part in ("DTSTART", "COUNT=", "UNTIL=")):
+            return None
+    else:
+        duration, invalid_formats, too_long = parse_entered_duration(every)
+        if invalid_formats or too_long or not duration:
+            return None
+
+        if duration.years or duration.months:
+            if duration.days or duration.hours or duration.minutes or duration.seconds:
+                return None  # months aren't a fixed length, so can't be mixed with smaller units
+            rule = f"FREQ=MONTHLY;INTERVAL={duration.years * 12 + duration.months}"
         else:
-            invalid_formats.append(d)
+            seconds = ((duration.days * 24 + duration.hours) * 60 + duration.minutes) * 60 + duration.seconds
+            for freq, length in _RECURRENCE_UNITS:
+                if seconds % length == 0:
+                    rule = f"FREQ={freq};INTERVAL={seconds // length}"
+                    break
+            else:
+                rule = f"FREQ=SECONDLY;INTERVAL={seconds}"
+
+    try:
+        rrulestr(rule, dtstart=start)
+    except (ValueError, TypeError):
+        return None
+    return rule
+
+def describe_recurrence(rule: str) -> str:
+    """ Human-readable form of a rule made by `parse_recurrence`, e.g. 'every 2 weeks'. """
+
+    match = re.fullmatch(r"FREQ=(\w+);INTERVAL=(\d+)", rule)
+    if match is None or match.group(1) not in _RECURRENCE_NAMES:
+        return f"`{rule}`"
 
-    return duration, invalid_formats, too_long
\ No newline at end of file
+    name = _RECURRENCE_NAMES[match.group(1)]
+    interval = int(match.group(2))
+    return f"every {name}" if interval == 1 else f"every {interval} {name}s"
@@ -0,0 +1,68 @@
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class LRUCache:
+    """ Least-recently-used cache bounded by both entry count and the total size of its values.
+
+    Sizes are given by the caller when storing, in whatever unit the limit uses (e.g. bytes).
+    `hits` and `misses` count `get` calls, for tuning the limits. `generation` goes up with every
+    invalidation, so a value loaded while one happened can be recognised and not stored.
+    """
+
+    def __init__(self, max_entries: int, max_size: int):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()  # key -> (value, size), oldest first
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: int) -> None:
+        if size > self.max_size:
+            return
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+        self._entries[key] = (value, size)
+        self.size += size
+        while len(self._entries) > self.max_entries or self.size > self.max_size:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.size -= evicted_size
+
+    def pop(self, key: Hashable) -> Any | None:
+        self.generation += 1
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        self.size -= entry[1]
+        return entry[0]
+
+    def pop_where(self, predicate: Callable[[Hashable, Any], bool]) -> None:
+        """ Remove every entry for which `predicate(key, value)` is true. """
+        self.generation += 1
+        for key in [k for k, (v, _) in self._entries.items() if predicate(k, v)]:
+            self.pop(key)
+
+    def stats(self) -> dict[str, int | float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "size": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,136 @@
+import sys
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+import discord
+
+
+# Rough size of a record besides its strings: the object itself and its entries in the cache's dicts
+_RECORD_OVERHEAD = 400
+
+
+class CachedMessage:
+    """ The parts of a guild message needed for edit/delete logs and snipes, without the full `discord.Message`. """
+
+    __slots__ = ('id', 'guild_id', 'channel_id', 'author_id', 'author_name', 'author_avatar', 'author_bot',
+                 'content', 'attachments', 'sticker_url', 'stored_at', 'size')
+
+    def __init__(self, message: discord.Message):
+        self.id: int = message.id
+        self.guild_id: int = message.guild.id
+        self.channel_id: int = message.channel.id
+        self.author_id: int = message.author.id
+        self.author_name: str = message.author.name
+        self.author_avatar: str = message.author.display_avatar.url
+        self.author_bot: bool = message.author.bot
+        self.content: str = message.content
+        # (filename, proxy_url) pairs
+        self.attachments: tuple[tuple[str, str], ...] = tuple((a.filename, a.proxy_url) for a in message.attachments)
+        self.sticker_url: str | None = message.stickers[0].url if message.stickers else None
+        self.stored_at: float = time.monotonic()
+        # Approximate bytes held, for the cache's memory budget
+        self.size: int = (_RECORD_OVERHEAD + sys.getsizeof(self.content) + sys.getsizeof(self.author_name) + sys.getsizeof(self.author_avatar)
+                          + sum(sys.getsizeof(filename) + sys.getsizeof(url) for filename, url in self.attachments)
+                          + (sys.getsizeof(self.sticker_url) if self.sticker_url else 0))
+
+    @property
+    def created_at(self) -> datetime:
+        return discord.utils.snowflake_time(self.id)
+
+    @property
+    def jump_url(self) -> str:
+        return f"https://discord.com/channels/{self.guild_id}/{self.channel_id}/{self.id}"
+
+
+class MessageCache:
+    """ Memory-bounded store of recent guild messages, independent of discord.py's own message cache.
+
+    Each guild keeps at most `per_guild` messages, and entries older than `ttl` seconds are evicted.
+    Messages are stored in arrival order, so the oldest entries are always at the front. Across all
+    guilds at most `max_total` messages, of roughly `max_bytes` in total, are kept, evicting the least
+    recently used first.
+    """
+
+    def __init__(self, per_guild: int = 2000, max_total: int = 50_000, max_bytes: int = 64 * 1024 * 1024,
+                 ttl: float = 6 * 60 * 60, sweep_every: int = 1000):
+        self.per_guild = per_guild
+        self.max_total = max_total
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sweep_every = sweep_every
+        self._guilds: dict[int, OrderedDict[int, CachedMessage]] = {}
+        self._index: OrderedDict[int, int] = OrderedDict()  # message_id -> guild_id, least recently used first
+        self._adds = 0
+        self.size = 0  # approximate bytes held by the stored records
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def add(self, message: discord.Message) -> None:
+        record = CachedMessage(message)
+        messages = self._guilds.get(record.guild_id)
+        if messages is None:
+            messages = self._guilds[record.guild_id] = OrderedDict()
+
+        messages[record.id] = record
+        self._index[record.id] = record.guild_id
+        self.size += record.size
+        if len(messages) > self.per_guild:
+            self.pop(next(iter(messages)))
+        while len(self._index) > self.max_total or self.size > self.max_bytes:
+            self.pop(next(iter(self._index)))
+
+        self._adds += 1
+        if self._adds >= self.sweep_every:
+            self._adds = 0
+            self.sweep()
+
+    def get(self, message_id: int) -> CachedMessage | None:
+        guild_id = self._index.get(message_id)
+        if guild_id is None:
+            return None
+        record = self._guilds[guild_id][message_id]
+        if time.monotonic() - record.stored_at > self.ttl:
+            self.pop(message_id)
+            return None
+        self._index.move_to_end(message_id)
+        return record
+
+    def pop(self, message_id: int) -> CachedMessage | None:
+        guild_id = self._index.pop(message_id, None)
+        if guild_id is None:
+            return None
+        messages = self._guilds[guild_id]
+        record = messages.pop(message_id)
+        self.size -= record.size
+        if not messages:
+            del self._guilds[guild_id]
+        return record
+
+    def update(self, message: discord.Message) -> CachedMessage | None:
+        """ Replace a stored message with its edited version, returning the previous record (if any). """
+        before = self.get(message.id)
+        if before is not None:
+            after = CachedMessage(message)
+            after.stored_at = before.stored_at  # keep arrival order, so TTL eviction stays front-to-back
+            self._guilds[before.guild_id][message.id] = after
+            self.size += after.size - before.size
+            while self.size > self.max_bytes:
+                self.pop(next(iter(self._index)))
+        return before
+
+    def sweep(self) -> None:
+        """ Drop every entry older than the TTL. """
+        cutoff = time.monotonic() - self.ttl
+        for guild_id in list(self._guilds):
+            messages = self._guilds[guild_id]
+            while messages:
+                message_id, record = next(iter(messages.items()))
+                if record.stored_at > cutoff:
+                    break
+                del messages[message_id]
+                self._index.pop(message_id, None)
+                self.size -= record.size
+            if not messages:
+                del self._guilds[guild_id]
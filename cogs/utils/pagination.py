@@ -1,4 +1,5 @@
 import logging
+import abc
 
 import discord
 from discord import ui
@@ -9,18 +10,51 @@ from .views import handle_view_edit
 log = logging.getLogger(__name__)
 
 
+class PageSource(abc.ABC):
+    """ Supplies the pages of a `PaginationEmbedsView`, so they can be built only when they're shown. """
+
+    page_count: int = 0
+
+    async def prepare(self) -> None:
+        """ Called once before the first page is shown, e.g. to work out `page_count`. """
+        pass
+
+    @abc.abstractmethod
+    async def get_page(self, index: int) -> discord.Embed:
+        ...
+
+
+class ListPageSource(PageSource):
+    """ Pages that were all built up front. """
+
+    def __init__(self, embeds: list[discord.Embed]) -> None:
+        self.embeds = embeds
+        self.page_count = len(embeds)
+
+    async def get_page(self, index: int) -> discord.Embed:
+        return self.embeds[index]
+
+
 class PaginationEmbedsView(ui.View):
-    """ A `ui.View` class to paginate a list of embeds. """
+    """ A `ui.View` class to paginate a list of embeds, or the pages of a `PageSource`.
+
+    Sources other than a plain list must be started with `start()`, which returns the first page.
+    """
 
-    def __init__(self, embeds: list[discord.Embed], timeout: int = 300, author_id: int|None = None) -> None:
+    def __init__(self, embeds: list[discord.Embed] | PageSource, timeout: int = 300, author_id: int|None = None) -> None:
         super().__init__(timeout=timeout)
-        self.embeds = embeds
+        self.source = embeds if isinstance(embeds, PageSource) else ListPageSource(embeds)
         self.current_page = 0
         self.author_id = author_id
         self.message = None
 
         self.update_button_states()
 
+    async def start(self) -> discord.Embed:
+        await self.source.prepare()
+        self.update_button_states()
+        return await self.source.get_page(0)
+
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         if self.author_id and interaction.user.id != self.author_id:
             await interaction.response.send_message("you are not the owner of this message grr", ephemeral=True)
@@ -28,23 +62,26 @@ class PaginationEmbedsView(ui.View):
         return True
 
     def update_button_states(self) -> None:
+        last_page = max(self.source.page_count - 1, 0)
         self.first_page_button.disabled = self.current_page == 0
         self.prev_button.disabled = self.current_page == 0
-        self.page_counter.label = f"Page {self.current_page + 1}/{len(self.embeds)}"
-        self.next_button.disabled = self.current_page == len(self.embeds) - 1
-        self.last_page_button.disabled = self.current_page == len(self.embeds) - 1
+        self.page_counter.label = f"Page {self.current_page + 1}/{max(self.source.page_count, 1)}"
+        self.next_button.disabled = self.current_page == last_page
+        self.last_page_button.disabled = self.current_page == last_page
+
+    async def show_page(self, interaction: discord.Interaction, page: int) -> None:
+        self.current_page = page
+        self.update_button_states()
+        embed = await self.source.get_page(page)
+        await interaction.response.edit_message(embed=embed, view=self)
 
     @ui.button(label="≪", style=discord.ButtonStyle.gray)
     async def first_page_button(self, interaction: discord.Interaction, button: ui.Button):
-        self.current_page = 0
-        self.update_button_states()
-        await interaction.response.edit_message(embed=self.embeds[self.current_page], view=self)
+        await self.show_page(interaction, 0)
 
     @ui.button(label="Previous", style=discord.ButtonStyle.blurple)
     async def prev_button(self, interaction: discord.Interaction, button: ui.Button):
-        self.current_page -= 1
-        self.update_button_states()
-        await interaction.response.edit_message(embed=self.embeds[self.current_page], view=self)
+        await self.show_page(interaction, self.current_page - 1)
 
     @ui.button(label="Page 0/0", style=discord.ButtonStyle.gray)
     async def page_counter(self, interaction: discord.Interaction, button: ui.Button):
@@ -52,19 +89,14 @@ class PaginationEmbedsView(ui.View):
 
     @ui.button(label="Next", style=discord.ButtonStyle.blurple)
     async def next_button(self, interaction: discord.Interaction, button: ui.Button):
-        self.current_page += 1
-        self.update_button_states()
-        await interaction.response.edit_message(embed=self.embeds[self.current_page], view=self)
+        await self.show_page(interaction, self.current_page + 1)
 
     @ui.button(label="≫", style=discord.ButtonStyle.gray)
     async def last_page_button(self, interaction: discord.Interaction, button: ui.Button):
-        self.current_page = len(self.embeds) - 1
-        self.update_button_states()
-        await interaction.response.edit_message(embed=self.embeds[self.current_page], view=self)
+        await self.show_page(interaction, self.source.page_count - 1)
 
     async def on_timeout(self) -> None:
         for item in self.children:
             item.disabled = True
 
         await handle_view_edit(self.message, view=self)
-
@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+from itertools import islice
+import asyncio
+import json
+import sys
+
+from dateutil.rrule import rrulestr
+
+
+RECURRENCE_TIMEOUT = 1.5  # seconds to work out a rule's occurrences, before its process is killed
+
+
+async def expand_recurrence(rule: str, start: datetime, after: datetime, count: int, timeout: float = RECURRENCE_TIMEOUT) -> list[datetime]:
+    """ Up to `count` occurrences of `rule` (anchored on `start`, in its timezone) that come after `after`, in UTC.
+
+    dateutil walks a rule one period at a time until year 9999 when nothing matches, e.g. `BYMONTH=2;BYMONTHDAY=30`,
+    which takes many seconds; so rules are expanded in a child process that's killed after `timeout` seconds.
+
+    Raises `TimeoutError` if that happens, and `ValueError` if the rule is invalid.
+    """
+    request = {
+        "rule": rule,
+        "start": start.astimezone(timezone.utc).isoformat(),
+        "tz": getattr(start.tzinfo, "key", None),  # a ZoneInfo's name, so the rule follows its DST changes
+        "after": after.astimezone(timezone.utc).isoformat(),
+        "count": count,
+    }
+
+    # Run as a script rather than a module, so the child doesn't import the bot
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, __file__,
+        stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(json.dumps(request).encode()), timeout=timeout)
+    finally:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+
+    if not stdout:
+        raise RuntimeError("the recurrence process exited without a result")
+    result = json.loads(stdout)
+    if "error" in result:
+        raise ValueError(result["error"])
+    return [datetime.fromisoformat(occurrence) for occurrence in result["occurrences"]]
+
+
+def _serve() -> None:
+    request = json.loads(sys.stdin.read())
+    tz = ZoneInfo(request["tz"]) if request["tz"] else timezone.utc
+    start = datetime.fromisoformat(request["start"]).astimezone(tz)
+    after = datetime.fromisoformat(request["after"])
+
+    try:
+        upcoming = islice((occurrence for occurrence in rrulestr(request["rule"], dtstart=start) if occurrence > after), request["count"])
+        result = {"occurrences": [occurrence.astimezone(timezone.utc).isoformat() for occurrence in upcoming]}
+    except (ValueError, TypeError) as e:
+        result = {"error": str(e)}
+    print(json.dumps(result), flush=True)
+
+
+if __name__ == "__main__":
+    _serve()
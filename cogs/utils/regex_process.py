@@ -0,0 +1,70 @@
+import asyncio
+import json
+import sys
+import re
+
+
+class RegexProcess:
+    """ Searches text with a user-supplied regex in a child process, which is killed if a search takes too long.
+
+    CPython's `re` holds the GIL while it searches and can't be interrupted, so neither a thread nor
+    `asyncio.wait_for` can stop a pattern that backtracks for minutes; killing a process can.
+    """
+
+    def __init__(self, pattern: str, timeout: float) -> None:
+        self.pattern = pattern
+        self.timeout = timeout
+        self._process: asyncio.subprocess.Process | None = None
+
+    async def start(self) -> None:
+        # Run as a script rather than a module, so the child doesn't import the bot
+        self._process = await asyncio.create_subprocess_exec(
+            sys.executable, __file__,
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+        )
+        self._process.stdin.write(json.dumps(self.pattern).encode() + b'\n')
+
+    async def close(self) -> None:
+        if self._process is None:
+            return
+        if self._process.returncode is None:
+            self._process.kill()
+        await self._process.wait()
+
+    async def matching(self, texts: list[str]) -> list[int]:
+        """ The indexes of `texts` that the pattern matches (searching, like `re.search`).
+
+        Raises `TimeoutError` if the search takes longer than `timeout` seconds, after which the process is
+        dead, and `RuntimeError` if the process has otherwise exited.
+        """
+        if self._process.returncode is not None:
+            raise RuntimeError("the regex process has exited")
+
+        async def exchange() -> bytes:
+            self._process.stdin.write(json.dumps(texts).encode() + b'\n')
+            await self._process.stdin.drain()
+            return await self._process.stdout.readline()
+
+        try:
+            line = await asyncio.wait_for(exchange(), timeout=self.timeout)
+        except (TimeoutError, ConnectionResetError, BrokenPipeError) as e:
+            self._process.kill()
+            if isinstance(e, TimeoutError):
+                raise
+            raise RuntimeError("the regex process has exited") from e
+
+        if not line:
+            raise RuntimeError("the regex process has exited")
+        return json.loads(line)
+
+
+def _serve() -> None:
+    # The pattern comes first, then one JSON list of strings per line in and one JSON list of matching indexes per line out
+    pattern = re.compile(json.loads(sys.stdin.readline()))
+    for line in sys.stdin:
+        texts = json.loads(line)
+        print(json.dumps([i for i, text in enumerate(texts) if pattern.search(text)]), flush=True)
+
+
+if __name__ == "__main__":
+    _serve()
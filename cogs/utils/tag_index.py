@@ -0,0 +1,183 @@
+import asyncio
+from bisect import bisect_left, insort
+from collections import Counter
+
+from bot import Woolinator
+
+
+def trigrams(text: str) -> set[str]:
+    """ The three-character windows of `text`, padded so that short strings and word starts count too. """
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class GuildTagNames:
+    """ The names and owners of one guild's tags, kept sorted by lowercase name for prefix lookups.
+
+    Names are also indexed by trigram, for fuzzy search and "did you mean" suggestions.
+    """
+
+    __slots__ = ('_keys', '_tags', '_by_owner', '_trigrams')
+
+    def __init__(self, rows: list[tuple[str, int]]):
+        self._tags: dict[str, tuple[str, int]] = {name.lower(): (name, owner_id) for name, owner_id in rows}  # key -> (name, owner)
+        self._keys: list[str] = sorted(self._tags)
+        self._by_owner: dict[int, set[str]] = {}
+        self._trigrams: dict[str, set[str]] = {}  # trigram -> keys containing it
+        for key, (_, owner_id) in self._tags.items():
+            self._by_owner.setdefault(owner_id, set()).add(key)
+            for trigram in trigrams(key):
+                self._trigrams.setdefault(trigram, set()).add(key)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self._tags
+
+    def add(self, name: str, owner_id: int) -> None:
+        key = name.lower()
+        if key in self._tags:
+            self.remove(name)
+        self._tags[key] = (name, owner_id)
+        insort(self._keys, key)
+        self._by_owner.setdefault(owner_id, set()).add(key)
+        for trigram in trigrams(key):
+            self._trigrams.setdefault(trigram, set()).add(key)
+
+    def remove(self, name: str) -> None:
+        key = name.lower()
+        tag = self._tags.pop(key, None)
+        if tag is None:
+            return
+        del self._keys[bisect_left(self._keys, key)]
+        owned = self._by_owner[tag[1]]
+        owned.discard(key)
+        if not owned:
+            del self._by_owner[tag[1]]
+        for trigram in trigrams(key):
+            keys = self._trigrams[trigram]
+            keys.discard(key)
+            if not keys:
+                del self._trigrams[trigram]
+
+    def rename(self, name: str, new_name: str) -> None:
+        tag = self._tags.get(name.lower())
+        if tag is not None:
+            self.remove(name)
+            self.add(new_name, tag[1])
+
+    def set_owner(self, name: str, owner_id: int) -> None:
+        tag = self._tags.get(name.lower())
+        if tag is not None:
+            self.add(tag[0], owner_id)
+
+    def remove_owner(self, owner_id: int) -> None:
+        for key in list(self._by_owner.get(owner_id, ())):
+            self.remove(key)
+
+    def starts_with(self, prefix: str, owner_id: int | None = None, limit: int = 25) -> list[str]:
+        """ Names starting with `prefix` (case-insensitive) in alphabetical order, optionally only those owned by `owner_id`. """
+        prefix = prefix.lower()
+
+        if owner_id is not None:
+            # Members only own a handful of tags, so filtering their set beats walking the guild's names
+            keys = sorted(key for key in self._by_owner.get(owner_id, ()) if key.startswith(prefix))
+            return [self._tags[key][0] for key in keys[:limit]]
+
+        names = []
+        for i in range(bisect_left(self._keys, prefix), len(self._keys)):
+            key = self._keys[i]
+            if not key.startswith(prefix) or len(names) >= limit:
+                break
+            names.append(self._tags[key][0])
+        return names
+
+    def search(self, query: str, limit: int = 20, threshold: float = 0.3) -> list[str]:
+        """ Names containing `query` or similar to it, best matches first.
+
+        Similarity is the Jaccard index of the trigram sets. Names containing the query come first,
+        then the rest need a similarity of at least `threshold`.
+        """
+        query = query.lower()
+        query_trigrams = trigrams(query)
+
+        # Only names sharing a trigram with the query can score above zero
+        shared: Counter[str] = Counter()
+        for trigram in query_trigrams:
+            shared.update(self._trigrams.get(trigram, ()))
+
+        # Every name containing a query of 3+ characters shares its middle trigrams, but a shorter query
+        # only has padded ones, so names with it part way through are found by scanning
+        if len(query) < 3:
+            for key in self._keys:
+                if query in key and key not in shared:
+                    shared[key] = 0
+
+        ranked = []
+        for key, count in shared.items():
+            similarity = count / (len(query_trigrams) + len(trigrams(key)) - count)
+            contains = query in key
+            if contains or similarity >= threshold:
+                ranked.append((not contains, -similarity, key))
+
+        ranked.sort()
+        return [self._tags[key][0] for _, _, key in ranked[:limit]]
+
+
+class TagNameIndex:
+    """ In-memory `GuildTagNames` for every guild whose tags have been asked for.
+
+    A guild's names are read from the database the first time they are needed, then kept up to date by
+    the commands that change tags. Changes made while a guild is still loading mark that load as stale,
+    so it isn't kept and the next lookup reads the guild again.
+    """
+
+    def __init__(self, bot: Woolinator):
+        self.bot: Woolinator = bot
+        self._guilds: dict[int, GuildTagNames] = {}
+        self._loading: dict[int, asyncio.Task] = {}
+        self._stale: set[int] = set()
+
+    async def get(self, guild_id: int) -> GuildTagNames:
+        names = self._guilds.get(guild_id)
+        if names is not None:
+            return names
+
+        task = self._loading.get(guild_id)
+        if task is None:
+            task = self._loading[guild_id] = asyncio.create_task(self._load(guild_id))
+        return await asyncio.shield(task)
+
+    def peek(self, guild_id: int) -> GuildTagNames | None:
+        """ The guild's names if loaded, for keeping them up to date; anything not loaded is read fresh later. """
+        if guild_id in self._loading:
+            self._stale.add(guild_id)
+        return self._guilds.get(guild_id)
+
+    def forget(self, guild_id: int) -> None:
+        """ Drop a guild's names, e.g. after many changes at once, so they're read fresh when next needed. """
+        if guild_id in self._loading:
+            self._stale.add(guild_id)
+        self._guilds.pop(guild_id, None)
+
+    def remove_owner(self, owner_id: int) -> None:
+        """ Forget every tag owned by a user, in all guilds. """
+        self._stale.update(self._loading)
+        for names in self._guilds.values():
+            names.remove_owner(owner_id)
+
+    async def _load(self, guild_id: int) -> GuildTagNames:
+        try:
+            async with self.bot.get_cursor() as cursor:
+                await cursor.execute("SELECT name, user_id FROM tags WHERE guild_id = %s", (guild_id,))
+                rows = await cursor.fetchall()
+        finally:
+            del self._loading[guild_id]
+
+        names = GuildTagNames(rows)
+        if guild_id in self._stale:
+            self._stale.discard(guild_id)
+        else:
+            self._guilds[guild_id] = names
+        return names
@@ -29,6 +29,12 @@ class ChannelSelector(ui.View):
             # Remove the disable button if no channel is currently set
             self.remove_item(self.disable_button)
 
+    def _update_cache(self, guild_id: int, channel_id: int | None) -> None:
+        """ Keep the Logging cog's in-memory copy of the `channels` table in sync. """
+        cog = self.bot.get_cog("Logging")
+        if cog is not None:
+            cog.cache_channel(guild_id, self.code, channel_id)
+
     @ui.select(cls=ui.ChannelSelect, placeholder=f"Select a channel to enable feature...", channel_types=[discord.ChannelType.text])
     async def select_channel(self, interaction: discord.Interaction, select: ui.ChannelSelect):
         channel = select.values[0]
@@ -36,8 +42,9 @@ class ChannelSelector(ui.View):
             await cursor.execute('''
                     INSERT INTO channels (feature, guild_id, channel_id)
                     VALUES (%s, %s, %s)
-                    ON DUPLICATE KEY UPDATE channel_id = %s
+                    ON DUPLICATE KEY UPDATE channel_id = %s, webhook_id = NULL, webhook_token = NULL
                 ''', (self.code, interaction.guild_id, channel.id, channel.id))
+        self._update_cache(interaction.guild_id, channel.id)
         await interaction.response.edit_message(content=f"{tick(True)} {self.feature} channel set to {channel.mention}", view=None)
         self.stop()
 
@@ -45,6 +52,7 @@ class ChannelSelector(ui.View):
     async def disable_button(self, interaction: discord.Interaction, button: ui.Button):
         async with self.bot.get_cursor() as cursor:
             await cursor.execute("DELETE FROM channels WHERE guild_id = %s AND feature = %s", (interaction.guild_id, self.code))
+        self._update_cache(interaction.guild_id, None)
         await interaction.response.edit_message(content=f"{tick(False)} {self.feature} disabled", view=None)
         self.stop()
 
@@ -210,6 +210,28 @@ class Wooly(commands.Cog, command_attrs=dict(hidden=True)):
             file_obj = discord.File(fp=io.BytesIO(content.encode('utf-8')), filename=file)
             await ctx.reply(file=file_obj)
 
+    @commands.command(name="metrics", description="Show internal queue and cache metrics")
+    async def metrics(self, ctx: Context):
+        embed = discord.Embed(colour=discord.Colour.random())
+
+        reminder_cog = self.bot.get_cog("Reminders")
+        if reminder_cog is not None:
+            m = reminder_cog.delivery.metrics()
+            embed.add_field(name="Reminders", value=f"Scheduled (this window): {len(reminder_cog.scheduler)}\n"
+                                                    f"Queued: {m['queued']}\nIn flight: {m['in_flight']}\n"
+                                                    f"Delivered: {m['delivered']}\nFailed: {m['failed']}\nAwaiting delete: {m['pending_ack']}\n"
+                                                    f"Lag: {m['last_lag']:.1f}s (max {m['max_lag']:.1f}s)")
+
+        tags_cog = self.bot.get_cog("Tags")
+        if tags_cog is not None:
+            c = tags_cog.cache.stats()
+            embed.add_field(name="Tag cache", value=f"Entries: {c['entries']}/{tags_cog.cache.max_entries}\n"
+                                                    f"Size: {c['size'] / 1024:.1f}/{tags_cog.cache.max_size / 1024:.0f} KiB\n"
+                                                    f"Hits: {c['hits']}\nMisses: {c['misses']}\n"
+                                                    f"Hit rate: {c['hit_rate']:.1%}")
+
+        await ctx.reply(embed=embed)
+
     @commands.command(name="eval", description="Evaluate some Python code")
     async def eval(self, ctx: Context, *, code: str):
         env = {
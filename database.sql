@@ -42,10 +42,17 @@ CREATE TABLE IF NOT EXISTS `channels` (
   `feature` varchar(64) NOT NULL,
   `guild_id` bigint(20) UNSIGNED NOT NULL,
   `channel_id` bigint(20) UNSIGNED NOT NULL,
+  `webhook_id` bigint(20) UNSIGNED DEFAULT NULL,
+  `webhook_token` varchar(128) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin DEFAULT NULL,
   PRIMARY KEY (`id`),
   UNIQUE KEY `unique_feature_guild` (`feature`,`guild_id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
+-- Columns added after the table was first created
+ALTER TABLE `channels`
+  ADD COLUMN IF NOT EXISTS `webhook_id` bigint(20) UNSIGNED DEFAULT NULL AFTER `channel_id`,
+  ADD COLUMN IF NOT EXISTS `webhook_token` varchar(128) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin DEFAULT NULL AFTER `webhook_id`;
+
 -- --------------------------------------------------------
 
 --
@@ -55,9 +62,16 @@ CREATE TABLE IF NOT EXISTS `channels` (
 CREATE TABLE IF NOT EXISTS `guild_settings` (
   `guild_id` bigint(20) UNSIGNED NOT NULL,
   `mod_log_setup_done` tinyint(1) NOT NULL DEFAULT 0,
+  `voice_log_window` smallint(5) UNSIGNED NOT NULL DEFAULT 10,
+  `voice_log_max_hold` smallint(5) UNSIGNED NOT NULL DEFAULT 60,
   PRIMARY KEY (`guild_id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
+-- Columns added after the table was first created
+ALTER TABLE `guild_settings`
+  ADD COLUMN IF NOT EXISTS `voice_log_window` smallint(5) UNSIGNED NOT NULL DEFAULT 10 AFTER `mod_log_setup_done`,
+  ADD COLUMN IF NOT EXISTS `voice_log_max_hold` smallint(5) UNSIGNED NOT NULL DEFAULT 60 AFTER `voice_log_window`;
+
 -- --------------------------------------------------------
 
 --
@@ -75,6 +89,23 @@ CREATE TABLE IF NOT EXISTS `ignored_log_channels` (
 
 -- --------------------------------------------------------
 
+--
+-- Table structure for table `log_outbox`
+--
+
+CREATE TABLE IF NOT EXISTS `log_outbox` (
+  `id` bigint(20) UNSIGNED NOT NULL AUTO_INCREMENT,
+  `guild_id` bigint(20) UNSIGNED NOT NULL,
+  `channel_id` bigint(20) UNSIGNED NOT NULL,
+  `payload` mediumtext NOT NULL,
+  `attempts` tinyint(3) UNSIGNED NOT NULL DEFAULT 0,
+  `next_attempt` datetime NOT NULL,
+  PRIMARY KEY (`id`),
+  KEY `idx_next_attempt` (`next_attempt`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+-- --------------------------------------------------------
+
 --
 -- Table structure for table `prefixes`
 --
@@ -122,11 +153,25 @@ CREATE TABLE IF NOT EXISTS `reminders` (
   `content` varchar(2000) NOT NULL,
   `is_dm` tinyint(1) NOT NULL DEFAULT 0,
   `link` varchar(128) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
+  `recurrence` varchar(255) DEFAULT NULL,
+  `recur_until` datetime DEFAULT NULL,
+  `recur_left` smallint(5) UNSIGNED DEFAULT NULL,
   PRIMARY KEY (`id`),
-  KEY `idx_user` (`user_id`),
+  KEY `idx_user_created` (`user_id`,`time_created`),
   KEY `idx_time_expire` (`time_expire`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
+-- Columns added after the table was first created
+ALTER TABLE `reminders`
+  ADD COLUMN IF NOT EXISTS `recurrence` varchar(255) DEFAULT NULL AFTER `link`,
+  ADD COLUMN IF NOT EXISTS `recur_until` datetime DEFAULT NULL AFTER `recurrence`,
+  ADD COLUMN IF NOT EXISTS `recur_left` smallint(5) UNSIGNED DEFAULT NULL AFTER `recur_until`;
+
+-- Indexes added after the table was first created
+ALTER TABLE `reminders`
+  ADD INDEX IF NOT EXISTS `idx_user_created` (`user_id`,`time_created`),
+  DROP INDEX IF EXISTS `idx_user`;
+
 -- --------------------------------------------------------
 
 --
@@ -139,9 +184,37 @@ CREATE TABLE IF NOT EXISTS `tags` (
   `guild_id` bigint(20) UNSIGNED NOT NULL,
   `created` datetime NOT NULL,
   `name` varchar(32) NOT NULL,
+  `name_lower` varchar(32) NOT NULL DEFAULT (LOWER(`name`)),
   `content` varchar(2000) NOT NULL,
+  `uses` int(10) UNSIGNED NOT NULL DEFAULT 0,
   PRIMARY KEY (`id`),
-  UNIQUE KEY `unique_guild_name` (`guild_id`,`name`),
-  KEY `idx_user_guild` (`user_id`,`guild_id`)
+  UNIQUE KEY `unique_guild_name_lower` (`guild_id`,`name_lower`),
+  KEY `idx_user_guild` (`user_id`,`guild_id`),
+  KEY `idx_guild_uses` (`guild_id`,`uses`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+-- Columns added after the table was first created
+-- Existing rows take `name_lower` from the default expression when the column is added, so there's no
+-- separate backfill to scan the table on every startup
+ALTER TABLE `tags`
+  ADD COLUMN IF NOT EXISTS `name_lower` varchar(32) NOT NULL DEFAULT (LOWER(`name`)) AFTER `name`,
+  ADD COLUMN IF NOT EXISTS `uses` int(10) UNSIGNED NOT NULL DEFAULT 0 AFTER `content`;
+
+-- Indexes added after the table was first created
+ALTER TABLE `tags`
+  ADD UNIQUE INDEX IF NOT EXISTS `unique_guild_name_lower` (`guild_id`,`name_lower`),
+  ADD INDEX IF NOT EXISTS `idx_guild_uses` (`guild_id`,`uses`),
+  DROP INDEX IF EXISTS `unique_guild_name`;
+
+-- --------------------------------------------------------
+
+--
+-- Table structure for table `user_settings`
+--
+
+CREATE TABLE IF NOT EXISTS `user_settings` (
+  `user_id` bigint(20) UNSIGNED NOT NULL,
+  `timezone` varchar(64) DEFAULT NULL,
+  PRIMARY KEY (`user_id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 COMMIT;